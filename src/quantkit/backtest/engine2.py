@@ -46,8 +46,10 @@ def run_signals(
     if side != "long":
         raise NotImplementedError("Short-stöd kommer senare.")
 
-    df = bars.copy().reset_index(drop=True)
-    ts = pd.to_datetime(df["ts"])
+    df = bars.reset_index(drop=True)  # bars är read-only här
+    ts = df["ts"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
     o = df["open"].astype(float).to_numpy()
     h = df["high"].astype(float).to_numpy()
     l = df["low"].astype(float).to_numpy()
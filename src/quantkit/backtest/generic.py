@@ -48,7 +48,9 @@ def run_signals(
       - Equity är 1.0 i start och multipliceras med (1 + ret_net).
     """
     df = bars.dropna(subset=["open","high","low","close"]).reset_index(drop=True).copy()
-    ts = pd.to_datetime(df["ts"])
+    ts = df["ts"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
     o, h, l, c = [df[k].astype(float).to_numpy() for k in ("open","high","low","close")]
     entry = entry.reindex(df.index).fillna(False).to_numpy(bool)
     exit_rule = exit_rule.reindex(df.index).fillna(False).to_numpy(bool)
@@ -1,38 +1,97 @@
 # src/quantkit/cli_data.py
 from __future__ import annotations
 
+import json
+import mmap
 import os
+import pickle
+import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 import typing as T
 
 import typer
-import yaml
 
-try:
-    from quantkit.data import load_bars  # type: ignore
-except Exception:  # pragma: no cover
-    load_bars = None  # type: ignore
-
-from quantkit.data.market_hours import is_open_stockholm, is_open_us
-
-try:
-    import requests  # type: ignore
-except Exception:  # pragma: no cover
-    requests = None  # type: ignore
+# yaml, requests, pandas (market_hours) och loadern importeras först vid behov,
+# så att t.ex. `quantkit data --help` slipper importkostnaden.
 
 app = typer.Typer(add_completion=False, help="Data sync CLI för Quantkit")
 
 # -------- utils --------
 def _read_watchlist_codes(path: str = "watchlist.yaml") -> list[str]:
-    p = Path(path)
-    if not p.exists():
+    return _load_cached_list(Path(path), "watchlist")
+
+
+def _read_tickers_txt(path: str = "config/tickers.txt") -> list[str]:
+    return _load_cached_list(Path(path), "tickers")
+
+
+def _load_cached_list(path: Path, kind: str) -> list[str]:
+    """Parsad symbollista från fil; cachas per process och via pickle-sidecar."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
         return []
+    return list(_load_cached_list_cached(str(path), mtime_ns, kind))
+
+
+def _sidecar_path(p: Path) -> Path:
+    return p.with_name(p.name + ".pkl")
+
+
+def _read_sidecar(p: Path, mtime_ns: int) -> tuple[str, ...] | None:
     try:
-        doc = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        with _sidecar_path(p).open("rb") as f:
+            stamp, codes = pickle.load(f)
     except Exception:
-        return []
+        return None
+    return tuple(codes) if stamp == mtime_ns else None
+
+
+def _write_sidecar(p: Path, mtime_ns: int, codes: tuple[str, ...]) -> None:
+    side = _sidecar_path(p)
+    tmp = side.with_name(f"{side.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(pickle.dumps((mtime_ns, codes), protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, side)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=8)
+def _load_cached_list_cached(path: str, mtime_ns: int, kind: str) -> tuple[str, ...]:
+    # mtime_ns ingår i nyckeln så att en ändrad fil läses om.
+    # Mellan processer återanvänds parsningen via en pickle-sidecar (<fil>.pkl).
+    p = Path(path)
+    cached = _read_sidecar(p, mtime_ns)
+    if cached is not None:
+        return cached
+    codes = _LIST_PARSERS[kind](p)
+    _write_sidecar(p, mtime_ns, codes)
+    return codes
+
+
+@lru_cache(maxsize=1)
+def _yaml_loader():
+    import yaml
+
+    try:  # LibYAML-bindningar om de finns (~10x snabbare än ren Python)
+        return yaml, yaml.CSafeLoader
+    except AttributeError:  # pragma: no cover
+        return yaml, yaml.SafeLoader
+
+
+def _parse_watchlist(p: Path) -> tuple[str, ...]:
+    try:
+        yaml, loader = _yaml_loader()
+        with p.open("rb") as f:  # C-loadern läser binärt och detekterar kodning själv
+            doc = yaml.load(f, Loader=loader) or {}
+    except Exception:
+        return ()
     items = doc.get("items", []) or doc.get("tickers", [])
     out: list[str] = []
     for it in items:
@@ -42,20 +101,42 @@ def _read_watchlist_codes(path: str = "watchlist.yaml") -> list[str]:
             code = (it or {}).get("code")
         if code:
             out.append(str(code).strip())
-    return out
+    return tuple(out)
 
 
-def _read_tickers_txt(path: str = "config/tickers.txt") -> list[str]:
-    p = Path(path)
-    if not p.exists():
-        return []
-    return [ln.strip() for ln in p.read_text(encoding="utf-8").splitlines() if ln.strip()]
+def _parse_tickers_txt(p: Path) -> tuple[str, ...]:
+    # mmap + radvis läsning på bytes; bara icke-tomma rader avkodas
+    out: list[str] = []
+    try:
+        with p.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for ln in iter(mm.readline, b""):
+                    ln = ln.strip()
+                    if ln:
+                        out.append(ln.decode("utf-8", "replace"))
+    except (OSError, ValueError):
+        return ()
+    return tuple(out)
+
+
+_LIST_PARSERS: dict[str, T.Callable[[Path], tuple[str, ...]]] = {
+    "watchlist": _parse_watchlist,
+    "tickers": _parse_tickers_txt,
+}
+
+
+_SPLIT_RE = re.compile(r"[,\s;]+")
 
 
 def _coerce_list(val: str | None) -> list[str]:
+    """Dela på komma, semikolon eller blanksteg ("AAPL.US, ABB.ST;VOLV-B.ST")."""
     if not val:
         return []
-    return [x.strip() for x in val.split(",") if x.strip()]
+    if ";" not in val and not any(ch.isspace() for ch in val):
+        return [x for x in val.split(",") if x]  # vanligaste fallet: ren kommalista
+    return [x for x in _SPLIT_RE.split(val) if x]
 
 
 def _want_days(interval: str, days: int | None, eod_days: int, intra_days: int) -> int:
@@ -64,29 +145,203 @@ def _want_days(interval: str, days: int | None, eod_days: int, intra_days: int)
     return int(eod_days if interval.upper() == "EOD" else intra_days)
 
 
+@lru_cache(maxsize=8)
+def _mkt_open_cached(kind: str, minute_bucket: int) -> bool:
+    # minute_bucket i nyckeln => svaret lever högst en minut
+    from quantkit.data import market_hours as mh
+
+    return bool({"us": mh.is_open_us, "se": mh.is_open_stockholm}[kind]())
+
+
+def _mkt_open(kind: str) -> bool:
+    return _mkt_open_cached(kind, int(time.time() // 60))
+
+
+# börssuffix -> marknad för öppettidsgrind; okända suffix grindas inte
+_SUFFIX_MARKET = {"US": "us", "ST": "se", "SE": "se"}
+
+
+def _suffix(symbol: str) -> str:
+    i = symbol.rfind(".")
+    return symbol[i + 1:].upper() if i >= 0 else ""
+
+
+@lru_cache(maxsize=4096)
+def _market_of(symbol: str) -> str | None:
+    # suffix-tolkning en gång per symbol (samma universum varje sync-varv)
+    return _SUFFIX_MARKET.get(_suffix(symbol))
+
+
 def _gate_by_hours(symbol: str) -> bool:
-    if symbol.endswith(".US"):
-        return is_open_us()
-    if symbol.endswith(".ST"):
-        return is_open_stockholm()
-    return True
+    kind = _market_of(symbol)
+    return _mkt_open(kind) if kind else True
+
+
+def _filter_by_market_open(syms: list[str]) -> tuple[list[str], list[str]]:
+    """(öppna, stängda) – marknadsstatus slås upp en gång per marknad, inte per symbol."""
+    kinds = [_market_of(s) for s in syms]
+    open_map = {k: _mkt_open(k) for k in set(kinds) if k}
+    run_list: list[str] = []
+    closed: list[str] = []
+    for sym, kind in zip(syms, kinds):
+        (run_list if open_map.get(kind, True) else closed).append(sym)
+    return run_list, closed
+
+
+class _TokenBucket:
+    """
+    Token bucket delad mellan trådar: `rate` anrop/sek, burst upp till `capacity`.
+    AIMD: takten ökar långsamt vid lyckade anrop (on_success) och halveras vid
+    429/timeout (on_throttle), inom [min_rate, max_rate].
+    """
+
+    def __init__(self, rate: float, capacity: int = 1, *, min_rate: float | None = None, max_rate: float | None = None) -> None:
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self.min_rate = float(min_rate if min_rate is not None else self.rate)
+        self.max_rate = float(max_rate if max_rate is not None else self.rate)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def on_success(self) -> None:
+        if self.rate > 0:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate / 0.95)
+
+    def on_throttle(self) -> None:
+        if self.rate > 0:
+            with self._lock:
+                self.rate = max(self.min_rate, self.rate / 2.0)
+                self._tokens = min(self._tokens, 0.0)  # ingen burst direkt efter 429
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _bucket_for(sleep_between: float) -> _TokenBucket:
+    if sleep_between <= 0:
+        return _TokenBucket(rate=0.0)  # ingen begränsning
+    rate = 1.0 / max(sleep_between, 1e-3)
+    # sleep_between kan krympa till hälften när API:t är friskt och växa 16x vid strypning
+    return _TokenBucket(rate=rate, capacity=max(1, int(1.0 / sleep_between)), min_rate=rate / 16.0, max_rate=rate * 2.0)
+
+
+def _is_throttle(exc: BaseException) -> bool:
+    """
+    HTTP 429 eller timeout – signal att sänka takten. Den delade EODHD-sessionen
+    gör själv om 429 (urllib3 Retry); när försöken tar slut kommer 429:an som
+    RetryError -> MaxRetryError(reason=ResponseError("too many 429 ...")).
+    """
+    from urllib3.exceptions import MaxRetryError, ResponseError
+
+    seen: set[int] = set()
+    stack: list[object] = [exc]
+    while stack:
+        e = stack.pop()
+        if not isinstance(e, BaseException) or id(e) in seen:
+            continue
+        seen.add(id(e))
+        resp = getattr(e, "response", None)
+        if getattr(resp, "status_code", None) == 429:
+            return True
+        if isinstance(e, TimeoutError) or "Timeout" in type(e).__name__:
+            return True
+        if isinstance(e, MaxRetryError):
+            reason = e.reason
+            if isinstance(reason, ResponseError) and "429" in str(reason):
+                return True
+            stack.append(reason)
+        stack.extend(a for a in e.args if isinstance(a, BaseException))
+        stack.extend(x for x in (e.__cause__, e.__context__) if x is not None)
+    return False
+
+
+_FAIL_CACHE_PATH = Path.home() / ".cache" / "quantkit" / "fail_cache.json"
+
+
+class _FailCache:
+    """Nyligen misslyckade (symbol, intervall) på disk: {sym: {iv: expiry_epoch}}."""
+
+    def __init__(self, path: Path = _FAIL_CACHE_PATH, ttl: float = 600.0) -> None:
+        self.path = path
+        self.ttl = float(ttl)
+        self._lock = threading.Lock()
+        self._data: dict[str, dict[str, float]] = {}
+        if self.ttl > 0:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8")) or {}
+            except Exception:
+                self._data = {}
+
+    def blocked(self, sym: str, iv: str) -> bool:
+        if self.ttl <= 0:
+            return False
+        return self._data.get(sym, {}).get(iv, 0.0) > time.time()
+
+    def mark(self, sym: str, iv: str) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data.setdefault(sym, {})[iv] = time.time() + self.ttl
+
+    def clear(self, sym: str, iv: str) -> None:
+        with self._lock:
+            ivs = self._data.get(sym)
+            if ivs and ivs.pop(iv, None) is not None and not ivs:
+                del self._data[sym]
+
+    def save(self) -> None:
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        data = {s: {iv: exp for iv, exp in ivs.items() if exp > now} for s, ivs in self._data.items()}
+        data = {s: ivs for s, ivs in data.items() if ivs}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
 
 
 def _load_bars_safe(symbol: str, interval: str, days: int, debug: bool = False):
-    if load_bars is None:
-        raise RuntimeError("quantkit.data.load_bars kunde inte importeras")
+    try:
+        from quantkit.data import load_bars
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("quantkit.data.load_bars kunde inte importeras") from e
     return load_bars(symbol, interval=interval, days=days, debug=debug)  # type: ignore[call-arg]
 
 
-def _resolve_tickers(explicit: str | None) -> list[str]:
-    tickers = _coerce_list(explicit)
-    if tickers:
-        return tickers
-    tickers = _read_watchlist_codes("watchlist.yaml")
-    if tickers:
-        return tickers
-    tickers = _read_tickers_txt("config/tickers.txt")
-    return tickers
+def _exchange_key(symbol: str) -> str:
+    return symbol.rsplit(".", 1)[-1] if "." in symbol else ""
+
+
+def _resolve_tickers(explicit: str | None, debug: bool = False) -> list[str]:
+    tickers = (
+        _coerce_list(explicit)
+        or _read_watchlist_codes("watchlist.yaml")
+        or _read_tickers_txt("config/tickers.txt")
+    )
+    # Dubbletter bort (ordning bevaras), sedan grupperat per börs så att
+    # anrop mot samma värd kommer i följd och keep-alive-anslutningar återanvänds.
+    uniq = list(dict.fromkeys(tickers))
+    if debug and len(uniq) != len(tickers):
+        typer.echo(f"[debug] {len(tickers) - len(uniq)} dubbletter borttagna")
+    uniq.sort(key=_exchange_key)
+    return uniq
 
 
 # -------- notify helpers --------
@@ -100,34 +355,36 @@ def _run_url() -> str:
 
 
 def _notify(text: str) -> None:
-    sent = False
     try:
-        if requests is None:
-            raise RuntimeError("requests saknas")
+        try:
+            import requests
+        except ImportError as e:
+            raise RuntimeError("requests saknas") from e
 
+        # Slack och Telegram skickas parallellt – total väntan blir max, inte summa
+        jobs: dict[str, T.Callable[[], T.Any]] = {}
         hook = os.getenv("SLACK_WEBHOOK_URL", "").strip()
         if hook:
-            try:
-                requests.post(hook, json={"text": text}, timeout=10)
-                sent = True
-            except Exception as e:  # pragma: no cover
-                print(f"[notify] Slack fel: {e}", file=sys.stderr)
+            jobs["Slack"] = lambda: requests.post(hook, json={"text": text}, timeout=10)
 
         tg_token = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
         tg_chat = os.getenv("TELEGRAM_CHAT_ID", "").strip()
         if tg_token and tg_chat:
-            try:
-                url = f"https://api.telegram.org/bot{tg_token}/sendMessage"
-                requests.post(url, data={"chat_id": tg_chat, "text": text}, timeout=10)
-                sent = True
-            except Exception as e:  # pragma: no cover
-                print(f"[notify] Telegram fel: {e}", file=sys.stderr)
+            url = f"https://api.telegram.org/bot{tg_token}/sendMessage"
+            jobs["Telegram"] = lambda: requests.post(url, data={"chat_id": tg_chat, "text": text}, timeout=10)
+
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+            futures = {name: ex.submit(fn) for name, fn in jobs.items()}
+            for name, fut in futures.items():
+                try:
+                    fut.result()
+                except Exception as e:  # pragma: no cover
+                    print(f"[notify] {name} fel: {e}", file=sys.stderr)
     except Exception as e:  # pragma: no cover
         print(f"[notify] generellt fel: {e}", file=sys.stderr)
 
-    if not sent:
-        pass
-
 
 # -------- huvudkommando --------
 def _run_sync(
@@ -139,8 +396,10 @@ def _run_sync(
     gate_hours: bool,
     sleep_between: float,
     debug: bool,
+    max_workers: int = 8,
+    fail_ttl: float = 0.0,
 ) -> int:
-    syms = _resolve_tickers(tickers)
+    syms = _resolve_tickers(tickers, debug=debug)
     if not syms:
         typer.echo("❌ Inga tickers (ange --tickers, eller lägg till watchlist.yaml / config/tickers.txt)")
         return 1
@@ -151,6 +410,10 @@ def _run_sync(
     any_success = False
     any_error = False
     any_skip_only = True  # om *allt* blir skippat, ska vi inte faila
+    fail_cache = _FailCache(ttl=fail_ttl)
+    # Nätverksbundet: hämta parallellt, takten mot API:t styrs av en (adaptiv) token bucket
+    bucket = _bucket_for(sleep_between)
+    n_done = 0
 
     for iv in wanted:
         d = _want_days(iv, days, eod_days, intra_days)
@@ -158,45 +421,85 @@ def _run_sync(
 
         ok_count = 0
         err_count = 0
-        skip_count = 0
         errors: list[str] = []
+        # Rader per symbol buffras och skrivs i ett svep per intervall (löpande under --debug)
+        out: list[str] = []
+        emit: T.Callable[[str], None] = typer.echo if debug else out.append
 
-        for sym in syms:
-            try:
-                if gate_hours and iv.upper() != "EOD" and not _gate_by_hours(sym):
-                    typer.echo(f"⏭ {sym} {iv}: market closed (gated by hours)")
-                    continue
-
-                df = _load_bars_safe(sym, iv, d, debug=debug)
-                n = 0 if df is None else len(df)
-                typer.echo(f"✔ {sym} {iv}: {n} rader")
-                ok_count += 1
-                any_success = True
-                any_skip_only = False
-            except Exception as e:
-                msg = f"{sym} {iv}: {e}"
-                typer.echo(f"  ⚠ {msg}")
-                errors.append(msg)
-                err_count += 1
-                any_error = True
-                any_skip_only = False
-            time.sleep(float(sleep_between))
-
-        if err_count > 0 or summarize:
+        if gate_hours and iv.upper() != "EOD":
+            run_list, closed = _filter_by_market_open(syms)
+        else:
+            run_list, closed = list(syms), []
+        for sym in closed:
+            emit(f"⏭ {sym} {iv}: market closed (gated by hours)")
+        skip_count = len(closed)
+
+        recent_fail = [s for s in run_list if fail_cache.blocked(s, iv)]
+        failed_count = len(recent_fail)
+        if recent_fail:
+            run_list = [s for s in run_list if not fail_cache.blocked(s, iv)]
+            for sym in recent_fail:
+                emit(f"⏭ {sym} {iv}: misslyckades nyligen (--fail-ttl)")
+                errors.append(f"{sym} {iv}: misslyckades nyligen (fail-cache)")
+            # ett cachat fel är fortfarande ett fel (t.ex. ogiltig API-nyckel)
+            any_error = True
+            any_skip_only = False
+
+        def _fetch(sym: str, iv: str = iv, d: int = d):
+            bucket.acquire()
+            return _load_bars_safe(sym, iv, d, debug=debug)
+
+        with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as ex:
+            futures = {ex.submit(_fetch, sym): sym for sym in run_list}
+            for fut in as_completed(futures):
+                sym = futures[fut]
+                try:
+                    df = fut.result()
+                    n = 0 if df is None else len(df)
+                    emit(f"✔ {sym} {iv}: {n} rader")
+                    fail_cache.clear(sym, iv)
+                    ok_count += 1
+                    bucket.on_success()
+                    any_success = True
+                    any_skip_only = False
+                except Exception as e:
+                    msg = f"{sym} {iv}: {e}"
+                    emit(f"  ⚠ {msg}")
+                    errors.append(msg)
+                    if _is_throttle(e):
+                        bucket.on_throttle()  # strypt, inte död – ingen fail-cache
+                    else:
+                        fail_cache.mark(sym, iv)
+                    err_count += 1
+                    any_error = True
+                    any_skip_only = False
+                n_done += 1
+                if debug and bucket.rate > 0 and n_done % 50 == 0:
+                    typer.echo(f"[debug] takt {bucket.rate:.2f} anrop/s efter {n_done} hämtningar")
+
+        if out:
+            typer.echo("\n".join(out))
+
+        if err_count > 0 or failed_count > 0 or summarize:
             title = os.getenv("GITHUB_WORKFLOW", "quantkit data sync")
             run_url = _run_url()
             head = f"{title}: interval={iv}, days={d}, tickers={len(syms)}"
-            tail = f"ok={ok_count}, errors={err_count}, skipped_closed={skip_count}"
+            tail = (
+                f"ok={ok_count}, errors={err_count}, skipped_closed={skip_count}, "
+                f"skipped_failed={failed_count}"
+            )
             lines = [f"{head} → {tail}"]
-            if err_count > 0:
+            if errors:
                 for row in errors[:5]:
                     lines.append(f"- {row}")
             if run_url:
                 lines.append(run_url)
             _notify("\n".join(lines))
 
+    fail_cache.save()
+
     # Exit-kod:
-    # - om vi hade fel => 1
+    # - om vi hade fel (nya eller fortfarande fail-cachade) => 1
     # - om allt blev skippat pga stängt => 0 (grön bock i Actions)
     # - om vi hade minst en lyckad => 0
     if any_error:
@@ -211,10 +514,12 @@ def sync_cmd(
     eod_days: int = typer.Option(9000, help="Days för EOD om --days ej sätts"),
     intra_days: int = typer.Option(10, help="Days för intradag om --days ej sätts"),
     gate_hours: bool = typer.Option(True, "--gate-hours/--no-gate-hours", help="Skippa stängda marknader för intradag"),
-    sleep_between: float = typer.Option(0.25, help="Sömn mellan symboler (sek)"),
+    sleep_between: float = typer.Option(0.25, help="Tid mellan API-anrop (sek) vid start; anpassas efter 429/timeouts"),
     debug: bool = typer.Option(False, "--debug", help="Verbose loader"),
+    max_workers: int = typer.Option(8, "--max-workers", help="Antal parallella hämtningar"),
+    fail_ttl: float = typer.Option(0.0, "--fail-ttl", help="Hoppa över symboler som misslyckats senaste N sek (0 = av); räknas fortfarande som fel"),
 ):
-    code = _run_sync(tickers, interval, days, eod_days, intra_days, gate_hours, sleep_between, debug)
+    code = _run_sync(tickers, interval, days, eod_days, intra_days, gate_hours, sleep_between, debug, max_workers, fail_ttl)
     raise typer.Exit(code)
 
 
@@ -229,9 +534,11 @@ def main(
     gate_hours: bool = typer.Option(True, "--gate-hours/--no-gate-hours"),
     sleep_between: float = typer.Option(0.25),
     debug: bool = typer.Option(False, "--debug"),
+    max_workers: int = typer.Option(8, "--max-workers"),
+    fail_ttl: float = typer.Option(0.0, "--fail-ttl"),
 ):
     if ctx.invoked_subcommand is None:
-        code = _run_sync(tickers, interval, days, eod_days, intra_days, gate_hours, sleep_between, debug)
+        code = _run_sync(tickers, interval, days, eod_days, intra_days, gate_hours, sleep_between, debug, max_workers, fail_ttl)
         raise typer.Exit(code)
 
 
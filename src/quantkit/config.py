@@ -1,16 +1,34 @@
 from __future__ import annotations
+import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, List, Optional
 import yaml
 from pydantic import BaseModel, Field
 
+try:  # LibYAML-bindningar om de finns
+    from yaml import CSafeLoader as _YamlLoader  # type: ignore
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 class AppConfig(BaseModel):
     watchlist: List[str] = Field(default_factory=list)
     # övriga nycklar får finnas, vi bryr oss inte här.
 
+@lru_cache(maxsize=8)
+def _read_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    # (mtime_ns, size) i nyckeln => ändrad fil läses om
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+def _read_yaml(p: Path) -> Any:
+    st = p.stat()
+    # kopia så att anroparen kan mutera utan att förstöra cachen
+    return copy.deepcopy(_read_yaml_cached(str(p), st.st_mtime_ns, st.st_size))
+
 def load_app_config(path: str | Path = "config/settings.yml") -> AppConfig:
     p = Path(path)
-    raw = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    raw = _read_yaml(p) or {}
 
     # Migration: om filen har "items: [{name,code}, ...]" i stället för "watchlist: [codes]"
     if not raw.get("watchlist"):
@@ -21,7 +39,7 @@ def load_app_config(path: str | Path = "config/settings.yml") -> AppConfig:
     # Om även config/watchlist.yml finns – mergar in
     wlp = Path("config/watchlist.yml")
     if wlp.exists():
-        wr = yaml.safe_load(wlp.read_text(encoding="utf-8")) or {}
+        wr = _read_yaml(wlp) or {}
         if isinstance(wr.get("items"), list):
             extra = [it.get("code") for it in wr["items"] if isinstance(it, dict) and it.get("code")]
             raw["watchlist"] = list(dict.fromkeys((raw.get("watchlist") or []) + extra))
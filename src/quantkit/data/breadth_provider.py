@@ -29,11 +29,18 @@ from typing import List, Dict, Optional, Literal
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow as pa
+except Exception:  # pragma: no cover
+    pa = None
+
 logger = logging.getLogger(__name__)
 
 # Path to breadth data storage
 BREADTH_DATA_DIR = Path("storage/breadth")
 BREADTH_CACHE: Dict[str, pd.DataFrame] = {}
+# mtime_ns of the file each BREADTH_CACHE entry came from (another process may rewrite it)
+_BREADTH_STAMPS: Dict[str, int] = {}
 
 
 class BreadthBar:
@@ -90,8 +97,8 @@ def load_breadth_series(
     Returns DataFrame with columns: time (UTC), advances, declines, unchanged
     
     Data sources (in priority order):
-    1. Cached parquet file: storage/breadth/{market_key}_{timeframe}.parquet
-    2. Computed from historical constituent data (expensive)
+    1. Arrow IPC file: storage/breadth/{market_key}_{timeframe}.arrow (memory-mapped)
+    2. Legacy parquet file: storage/breadth/{market_key}_{timeframe}.parquet
     3. Empty DataFrame if no data available
     
     Note: ADL requires historical seed value for parity. If data starts partway
@@ -99,28 +106,75 @@ def load_breadth_series(
     """
     cache_key = f"{market_key}_{timeframe}"
     
-    # Check cache
+    # Try Arrow IPC first (no decode), then legacy parquet
+    arrow_path = BREADTH_DATA_DIR / f"{cache_key}.arrow"
+    parquet_path = BREADTH_DATA_DIR / f"{cache_key}.parquet"
+    sources = []
+    for path, reader in ((arrow_path, _read_arrow), (parquet_path, pd.read_parquet)):
+        try:
+            sources.append((path, reader, path.stat().st_mtime_ns))
+        except OSError:
+            continue
+    
+    # Check cache (valid while the backing file is unchanged on disk)
     if cache_key in BREADTH_CACHE:
-        df = BREADTH_CACHE[cache_key].copy()
-        return _filter_date_range(df, start, end)
+        if not sources or _BREADTH_STAMPS.get(cache_key) == sources[0][2]:
+            df = BREADTH_CACHE[cache_key].copy()
+            return _filter_date_range(df, start, end)
     
-    # Try to load from parquet
-    parquet_path = BREADTH_DATA_DIR / f"{market_key}_{timeframe}.parquet"
-    if parquet_path.exists():
+    for path, reader, mtime_ns in sources:
         try:
-            df = pd.read_parquet(parquet_path)
+            df = reader(path)
             if "time" in df.columns:
-                df["time"] = pd.to_datetime(df["time"], utc=True)
+                df["time"] = _as_utc(df["time"])
             BREADTH_CACHE[cache_key] = df
+            _BREADTH_STAMPS[cache_key] = mtime_ns
             return _filter_date_range(df.copy(), start, end)
         except Exception as e:
-            logger.warning(f"Failed to load breadth data from {parquet_path}: {e}")
+            logger.warning(f"Failed to load breadth data from {path}: {e}")
     
     # No data available
     logger.info(f"No breadth data available for {market_key}_{timeframe}")
     return pd.DataFrame(columns=["time", "advances", "declines", "unchanged"])
 
 
+def bust_cache(market_key: Optional[str] = None, timeframe: Optional[str] = None) -> None:
+    """Drop in-process breadth cache entries (all, or one market/timeframe)."""
+    if market_key is None:
+        BREADTH_CACHE.clear()
+        _BREADTH_STAMPS.clear()
+        return
+    prefix = f"{market_key}_{timeframe}" if timeframe else f"{market_key}_"
+    for key in [k for k in BREADTH_CACHE if k == prefix or (not timeframe and k.startswith(prefix))]:
+        BREADTH_CACHE.pop(key, None)
+        _BREADTH_STAMPS.pop(key, None)
+
+
+def _as_utc(s: pd.Series) -> pd.Series:
+    """UTC datetime column; no-op when the dtype already is (e.g. straight from Arrow)."""
+    if isinstance(s.dtype, pd.DatetimeTZDtype) and str(s.dt.tz) == "UTC":
+        return s
+    return pd.to_datetime(s, utc=True)
+
+
+def _read_arrow(path: Path) -> pd.DataFrame:
+    """Read an Arrow IPC file via memory map."""
+    if pa is None:
+        raise RuntimeError("pyarrow is not available")
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _write_arrow(df: pd.DataFrame, path: Path) -> None:
+    """Write an uncompressed Arrow IPC file atomically."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+
 def _filter_date_range(df: pd.DataFrame, start: Optional[datetime], end: Optional[datetime]) -> pd.DataFrame:
     """Filter DataFrame by date range."""
     if df.empty:
@@ -164,22 +218,27 @@ def save_breadth_series(
     timeframe: str,
     df: pd.DataFrame,
 ) -> Path:
-    """Save breadth data to parquet for caching."""
+    """Save breadth data as Arrow IPC (parquet if pyarrow is missing) for caching."""
     BREADTH_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    parquet_path = BREADTH_DATA_DIR / f"{market_key}_{timeframe}.parquet"
+    cache_key = f"{market_key}_{timeframe}"
     
     # Normalize columns
     if "time" in df.columns:
-        df["time"] = pd.to_datetime(df["time"], utc=True)
+        df["time"] = _as_utc(df["time"])
     
-    df.to_parquet(parquet_path, index=False)
+    if pa is not None:
+        out_path = BREADTH_DATA_DIR / f"{cache_key}.arrow"
+        _write_arrow(df, out_path)
+    else:  # pragma: no cover
+        out_path = BREADTH_DATA_DIR / f"{cache_key}.parquet"
+        df.to_parquet(out_path, index=False)
     
     # Update cache
-    cache_key = f"{market_key}_{timeframe}"
     BREADTH_CACHE[cache_key] = df.copy()
+    _BREADTH_STAMPS[cache_key] = out_path.stat().st_mtime_ns
     
-    logger.info(f"Saved {len(df)} breadth bars to {parquet_path}")
-    return parquet_path
+    logger.info(f"Saved {len(df)} breadth bars to {out_path}")
+    return out_path
 
 
 def compute_breadth_from_constituents(
@@ -201,63 +260,48 @@ def compute_breadth_from_constituents(
     Returns:
         DataFrame with columns: time, advances, declines, unchanged
     """
+    empty = pd.DataFrame(columns=["time", "advances", "declines", "unchanged"])
     if not constituent_ohlcv:
-        return pd.DataFrame(columns=["time", "advances", "declines", "unchanged"])
-    
-    # Collect all unique dates
-    all_dates = set()
-    for sym, df in constituent_ohlcv.items():
-        if "ts" in df.columns:
-            dates = pd.to_datetime(df["ts"], utc=True).dt.date.unique()
-            all_dates.update(dates)
-    
-    all_dates = sorted(all_dates)
-    
-    if not all_dates:
-        return pd.DataFrame(columns=["time", "advances", "declines", "unchanged"])
-    
-    breadth_rows = []
-    
-    for d in all_dates:
-        advances = 0
-        declines = 0
-        unchanged = 0
-        
-        for sym, df in constituent_ohlcv.items():
-            if df.empty or "ts" not in df.columns or "close" not in df.columns:
-                continue
-            
-            df["date"] = pd.to_datetime(df["ts"], utc=True).dt.date
-            
-            # Get today's close
-            today_rows = df[df["date"] == d]
-            if today_rows.empty:
-                continue
-            today_close = today_rows.iloc[-1]["close"]
-            
-            # Get previous day's close
-            prev_dates = df[df["date"] < d].sort_values("date")
-            if prev_dates.empty:
-                continue  # No previous close to compare
-            prev_close = prev_dates.iloc[-1]["close"]
-            
-            # Classify
-            if today_close > prev_close:
-                advances += 1
-            elif today_close < prev_close:
-                declines += 1
-            else:
-                unchanged += 1
-        
-        if advances > 0 or declines > 0 or unchanged > 0:
-            breadth_rows.append({
-                "time": datetime.combine(d, datetime.min.time()).replace(tzinfo=timezone.utc),
-                "advances": advances,
-                "declines": declines,
-                "unchanged": unchanged,
-            })
-    
-    return pd.DataFrame(breadth_rows)
+        return empty
+    
+    # One long frame (sym code, UTC day, close) for all constituents
+    frames = []
+    for code, (sym, df) in enumerate(constituent_ohlcv.items()):
+        if df.empty or "ts" not in df.columns or "close" not in df.columns:
+            continue
+        frames.append(pd.DataFrame({
+            "sym": code,
+            "time": _as_utc(df["ts"]).dt.floor("D").array,  # stays datetime64[UTC], no boxing
+            "close": df["close"].to_numpy(),
+        }))
+    if not frames:
+        return empty
+    
+    big = pd.concat(frames, ignore_index=True).dropna(subset=["time"])
+    # Last close per symbol and day, then compare with the symbol's previous day
+    big = (big.sort_values(["sym", "time"], kind="stable")
+              .drop_duplicates(["sym", "time"], keep="last")
+              .reset_index(drop=True))
+    grp = big.groupby("sym", sort=False)
+    has_prev = (grp.cumcount() > 0).to_numpy()
+    close = big["close"].to_numpy(dtype=np.float64)
+    prev = grp["close"].shift().to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        adv = has_prev & (close > prev)
+        dec = has_prev & (close < prev)
+    unch = has_prev & ~adv & ~dec  # incl. NaN closes, as before
+    
+    counts = pd.DataFrame({
+        "time": big["time"].array[has_prev],
+        "advances": adv[has_prev].astype(np.int64),
+        "declines": dec[has_prev].astype(np.int64),
+        "unchanged": unch[has_prev].astype(np.int64),
+    })
+    if counts.empty:
+        return empty
+    out = counts.groupby("time", sort=True).sum().reset_index()
+    out["time"] = pd.to_datetime(out["time"], utc=True)
+    return out
 
 
 # Placeholder for future breadth data ingestion
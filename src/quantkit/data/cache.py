@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 try:
@@ -23,22 +25,157 @@ def has_file(path: str | Path) -> bool:
     return Path(path).is_file()
 
 
-def parquet_read(path: str | Path) -> pd.DataFrame:
+def parquet_read(
+    path: str | Path,
+    *,
+    columns: list[str] | None = None,
+    filters: list | None = None,
+) -> pd.DataFrame:
+    """
+    Läs parquet. `columns`/`filters` skickas vidare till pyarrow, så att
+    t.ex. filters=[("ts", ">", last_ts)] hoppar över hela row groups via statistik.
+    """
     if _IMPORT_ERROR is not None:
         raise RuntimeError(f"pyarrow is not available: {_IMPORT_ERROR}")
     p = Path(path)
     if not p.is_file():
         return pd.DataFrame()
-    table = pq.read_table(p)
+    if filters is None:
+        df = _read_arrow_sidecar(p, columns)
+        if df is not None:
+            return df
+        st = p.stat()
+        cols = tuple(columns) if columns else None
+        return _read_table_cached(str(p), st.st_mtime_ns, st.st_size, cols).to_pandas(types_mapper=None)
+    table = pq.read_table(p, columns=columns, filters=filters, use_threads=True, memory_map=True)
     return table.to_pandas(types_mapper=None)
 
 
+@lru_cache(maxsize=32)
+def _read_table_cached(
+    path: str, mtime_ns: int, size: int, columns: tuple[str, ...] | None
+) -> "pa.Table":
+    # Nyckeln (mtime, storlek) gör att en omskriven fil läses om; träffar
+    # delar den oföränderliga Arrow-tabellen utan ny avkodning. Ingen memory
+    # map här: en cachad tabell får inte hålla filen mappad (Windows kan då
+    # inte ersätta den vid nästa skrivning).
+    cols = list(columns) if columns else None
+    return pq.read_table(path, columns=cols, use_threads=True)
+
+
 def parquet_write(df: pd.DataFrame, path: str | Path) -> None:
     if _IMPORT_ERROR is not None:
         raise RuntimeError(f"pyarrow is not available: {_IMPORT_ERROR}")
     p = _ensure_parent(path)
+    if "ts" in df.columns and not is_utc_ts(df["ts"]):
+        # datetime-ts lagras som timestamp[UTC] => läsare slipper tolka om.
+        # Andra dtyper (epoch-int, strängar) lämnas orörda: ingen gissning här.
+        ts = df["ts"]
+        if isinstance(ts.dtype, pd.DatetimeTZDtype):
+            df = df.assign(ts=ts.dt.tz_convert("UTC"))
+        elif pd.api.types.is_datetime64_dtype(ts.dtype):
+            df = df.assign(ts=ts.dt.tz_localize("UTC"))
     table = pa.Table.from_pandas(df)
-    pq.write_table(table, p)
+    _write_table(table, p)
+
+
+def dedup_sort_by_ts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sortera på ts och behåll första raden per ts (= drop_duplicates("ts") + sort_values("ts")),
+    men som en stabil int64-sortering + grannjämförelse i numpy. Förutsätter ts utan NaT.
+    """
+    if len(df) < 2:
+        return df.reset_index(drop=True)
+    ts = df["ts"].values.view("i8")
+    order = np.argsort(ts, kind="stable")
+    ts_sorted = ts[order]
+    keep = np.empty(ts.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(ts_sorted[1:], ts_sorted[:-1], out=keep[1:])
+    return df.iloc[order[keep]].reset_index(drop=True)
+
+
+def is_utc_ts(s: pd.Series) -> bool:
+    """True om serien redan är datetime64 med tz UTC (ingen omtolkning behövs)."""
+    return isinstance(s.dtype, pd.DatetimeTZDtype) and str(s.dtype.tz) == "UTC"
+
+
+# zstd ger ~30–50 % mindre filer än snappy; statistik per row group gör
+# filters=[("ts", ...)] billiga vid läsning.
+_PARQUET_WRITE_OPTS = dict(
+    compression="zstd",
+    compression_level=3,
+    use_dictionary=True,
+    row_group_size=50_000,
+    write_statistics=True,
+    data_page_size=1 << 20,
+)
+
+
+# Stora cachefiler får en okomprimerad Arrow IPC-kopia (<fil>.parquet.arrow) som
+# läses via memory map – ingen dekomprimering/avkodning vid upprepade läsningar.
+_ARROW_SIDECAR_MIN_ROWS = 10_000
+
+
+def _arrow_sidecar(p: Path) -> Path:
+    return p.with_name(p.name + ".arrow")
+
+
+# Parquet-filens (mtime_ns, storlek) vid skrivningen lagras i kopians schema;
+# kopian används bara vid exakt träff (mtime ensam räcker inte inom samma tick).
+_SIDECAR_KEY = b"quantkit.parquet_stat"
+
+
+def _stat_token(p: Path) -> bytes:
+    st = p.stat()
+    return f"{st.st_mtime_ns}:{st.st_size}".encode()
+
+
+def _write_table(table: "pa.Table", p: Path) -> None:
+    pq.write_table(table, p, **_PARQUET_WRITE_OPTS)
+    side = _arrow_sidecar(p)
+    if table.num_rows < _ARROW_SIDECAR_MIN_ROWS:
+        try:
+            side.unlink(missing_ok=True)  # ev. gammal kopia är inaktuell
+        except OSError:
+            pass  # öppen hos en läsare; stat matchar inte längre => ignoreras vid läsning
+        return
+    tmp = side.with_name(side.name + ".tmp")
+    try:
+        meta = dict(table.schema.metadata or {})
+        meta[_SIDECAR_KEY] = _stat_token(p)
+        table = table.replace_schema_metadata(meta)
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        tmp.replace(side)
+    except OSError:
+        # Sidokopian är best effort: en läsare kan ha den öppen (Windows), och en
+        # kvarlämnad gammal kopia ignoreras ändå eftersom dess stat inte matchar.
+        for f in (tmp, side):
+            try:
+                f.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def _read_arrow_sidecar(p: Path, columns: list[str] | None) -> pd.DataFrame | None:
+    # Mappningen lever bara under läsningen (to_pandas kopierar), så ingen
+    # referens hindrar att filen skrivs om efteråt.
+    side = _arrow_sidecar(p)
+    try:
+        token = _stat_token(p)
+        with pa.memory_map(str(side), "r") as source:
+            reader = pa.ipc.open_file(source)
+            if (reader.schema.metadata or {}).get(_SIDECAR_KEY) != token:
+                return None  # parquet skrevs om utan oss (eller kopian är för gammal)
+            table = reader.read_all()
+            if columns:
+                table = table.select(columns)
+            df = table.to_pandas(types_mapper=None)
+            del table
+            return df
+    except (OSError, pa.ArrowInvalid, KeyError):
+        return None
 
 
 # ---- Back-compat för äldre moduler som importerar dessa namn
@@ -65,16 +202,53 @@ def merge_bars(
     Merga nya bar-rader med existerande parquet på `path` via nyckelkolumner.
     Behåller senaste per nyckel.
     """
+    if _IMPORT_ERROR is None and has_file(path):
+        try:
+            out = _merge_bars_arrow(df_new, Path(path), key_cols)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            out = None  # t.ex. oförenliga scheman – pandas-vägen nedan
+        if out is not None:
+            return out
     if has_file(path):
         df_old = parquet_read(path)
         if not df_old.empty:
-            cols = sorted(set(df_old.columns) | set(df_new.columns))
-            df_old = df_old.reindex(columns=cols)
-            df_new = df_new.reindex(columns=cols)
+            # Samma kolumner (vanligast) => ingen union/reindex
+            if not df_old.columns.equals(df_new.columns):
+                cols = sorted(set(df_old.columns) | set(df_new.columns))
+                df_old = df_old.reindex(columns=cols)
+                df_new = df_new.reindex(columns=cols)
             out = pd.concat([df_old, df_new], ignore_index=True)
+            if list(out.columns) != sorted(out.columns):
+                out = out[sorted(out.columns)]
             out = out.drop_duplicates(subset=list(key_cols), keep="last")
             out = out.sort_values(list(key_cols))
             parquet_write(out, path)
             return out
     parquet_write(df_new, path)
     return df_new
+
+
+def _merge_bars_arrow(df_new: pd.DataFrame, p: Path, key_cols: tuple[str, ...]) -> pd.DataFrame | None:
+    """
+    merge_bars helt i Arrow: concat (schema-union), senaste rad per nyckel via
+    group_by på radordning, sortering på nycklarna. None => tom gammal fil.
+    """
+    old = pq.read_table(p)
+    if old.num_rows == 0:
+        return None
+    new = pa.Table.from_pandas(df_new, preserve_index=False)
+    if old.schema.equals(new.schema, check_metadata=False):
+        merged = pa.concat_tables([old, new])  # nollkopia, ingen schema-union
+    else:
+        merged = pa.concat_tables([old, new], promote_options="permissive")
+    cols = sorted(merged.column_names)
+    keys = list(key_cols)
+    merged = merged.append_column("__ord", pa.array(np.arange(merged.num_rows, dtype=np.int64)))
+    last = merged.group_by(keys, use_threads=False).aggregate([("__ord", "max")])
+    out = (
+        merged.take(last["__ord_max"])
+        .sort_by([(k, "ascending") for k in keys])
+        .select(cols)
+    )
+    _write_table(out, p)
+    return out.to_pandas()
@@ -1,11 +1,48 @@
 from __future__ import annotations
 import io
+import json
 import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pyarrow.csv as pacsv
+except Exception:  # pragma: no cover
+    pacsv = None
+
+
+@lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    # En delad Session => keep-alive mot api.github.com i stället för ny TLS per symbol
+    s = requests.Session()
+    s.headers["User-Agent"] = "quantkit/cache_remote"
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504), allowed_methods=frozenset({"GET"}))
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    s.mount("https://", adapter)
+    return s
+
+
+def _read_csv_bytes(data: bytes) -> pd.DataFrame:
+    # pyarrow:s flertrådade C++-parser direkt på bytes (ingen str-kopia); pandas som reserv
+    if pacsv is not None:
+        return pacsv.read_csv(io.BytesIO(data)).to_pandas()
+    return pd.read_csv(io.BytesIO(data))
+
+
+def _with_utc_ts(df: pd.DataFrame) -> pd.DataFrame:
+    # pyarrow tolkar ISO-tider med offset direkt till UTC => ingen ny parse då
+    if "ts" in df.columns and not (
+        isinstance(df["ts"].dtype, pd.DatetimeTZDtype) and str(df["ts"].dtype.tz) == "UTC"
+    ):
+        df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
+    return df
 
 
 def _safe_name(symbol: str) -> str:
@@ -18,6 +55,53 @@ def _local_cache_path(symbol: str, interval: str) -> Path:
     return Path("data/cache/eodhd") / f"{safe}__{interval}.csv"
 
 
+def _read_local(p: Path) -> pd.DataFrame:
+    if pacsv is not None:
+        return _with_utc_ts(pacsv.read_csv(str(p)).to_pandas())
+    return _with_utc_ts(pd.read_csv(p))
+
+
+# Nedladdade kopior hålls isär från lokalt producerade filer, så att
+# prefer_local fortsatt betyder "lokalt producerad" och kopiorna alltid
+# revalideras. ETag per fil i repot: {path_in_repo: etag}; 304 => kopian gäller.
+_MIRROR_DIR = Path("data/cache/eodhd/.remote")
+_ETAG_PATH = _MIRROR_DIR / ".etags.json"
+_ETAG_LOCK = threading.Lock()
+
+
+def _mirror_path(symbol: str, interval: str) -> Path:
+    return _MIRROR_DIR / f"{_safe_name(symbol)}__{interval}.csv"
+
+
+def _load_etags() -> dict[str, str]:
+    try:
+        return json.loads(_ETAG_PATH.read_text(encoding="utf-8")) or {}
+    except Exception:
+        return {}
+
+
+def _atomic_write(p: Path, data: bytes) -> None:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _store_local(p: Path, body: bytes, path_in_repo: str, etag: Optional[str]) -> None:
+    try:
+        _atomic_write(p, body)
+        if etag:
+            with _ETAG_LOCK:
+                etags = _load_etags()
+                etags[path_in_repo] = etag
+                _atomic_write(_ETAG_PATH, json.dumps(etags).encode("utf-8"))
+    except OSError:
+        pass  # cachning är best effort
+
+
 def load_cached_csv(
     symbol: str,
     interval: str,
@@ -31,7 +115,9 @@ def load_cached_csv(
     Läs en cachefil (CSV) för given symbol/interval.
     1) Försök lokalt under data/cache/eodhd/
     2) Om saknas, hämta från GitHub 'data'-branchen (kräver token om repo är privat).
-       Stödjer både 'raw' och base64 JSON-respons.
+       Stödjer både 'raw' och base64 JSON-respons. Svaret sparas som kopia under
+       data/cache/eodhd/.remote/ och dess ETag skickas som If-None-Match nästa
+       gång (304 => kopian, utan ny nedladdning).
 
     Kolumnen 'ts' parse:as som UTC datetimestamp om den finns.
     Returnerar tom DataFrame om filen saknas.
@@ -40,10 +126,7 @@ def load_cached_csv(
     p = _local_cache_path(symbol, interval)
     if prefer_local and p.exists():
         try:
-            df = pd.read_csv(p)
-            if "ts" in df.columns:
-                df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
-            return df
+            return _read_local(p)
         except Exception:
             pass  # fall back to remote
 
@@ -61,28 +144,33 @@ def load_cached_csv(
     headers = {"Accept": "application/vnd.github.v3.raw"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    mirror = _mirror_path(symbol, interval)
+    etag = _load_etags().get(path_in_repo) if mirror.exists() else None
+    if etag:
+        headers["If-None-Match"] = etag
 
     try:
-        r = requests.get(api_url, headers=headers, timeout=30)
+        r = _session().get(api_url, headers=headers, timeout=30)
+        if r.status_code == 304:
+            return _read_local(mirror)
         if r.status_code == 200 and r.headers.get("Content-Type", "").startswith("text/plain"):
             # Raw-innehåll (tack vare Accept: raw)
-            df = pd.read_csv(io.StringIO(r.text))
+            body = r.content
         elif r.status_code == 200:
             # Kan vara JSON med base64-krypterat innehåll
             js = r.json()
             if isinstance(js, dict) and js.get("encoding") == "base64":
                 import base64
-                content = base64.b64decode(js.get("content", "")).decode("utf-8", errors="replace")
-                df = pd.read_csv(io.StringIO(content))
+                body = base64.b64decode(js.get("content", ""))
             else:
                 return pd.DataFrame()
         elif r.status_code == 404:
             return pd.DataFrame()
         else:
             raise RuntimeError(f"GitHub API {r.status_code}: {r.text[:200]}")
+        df = _read_csv_bytes(body)
     except Exception as e:
         raise RuntimeError(f"Misslyckades läsa remote cache: {e}") from e
 
-    if "ts" in df.columns:
-        df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
-    return df
+    _store_local(mirror, body, path_in_repo, r.headers.get("ETag"))
+    return _with_utc_ts(df)
@@ -1,14 +1,19 @@
 # src/quantkit/data/eodhd_client.py
 from __future__ import annotations
 
-from typing import Literal, Dict, Tuple
+from typing import Any, Literal, Dict, Tuple
+from functools import lru_cache
 from pathlib import Path
 import os
 import pathlib as p
+import threading
+from concurrent.futures import Future
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote
+from urllib3.util.retry import Retry
 
 # optional dependency for YAML mapping
 try:
@@ -16,12 +21,91 @@ try:
 except Exception:  # pragma: no cover
     yaml = None
 
+# optional snabb JSON-parser (C); stdlib via resp.json() som reserv
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
 from ..env import get_eodhd_api_key
 from ..paths import CACHE_EODHD_DIR
-from .cache import parquet_read, parquet_write, has_file
+from .cache import parquet_read, parquet_write, has_file, is_utc_ts
 
 BASE = "https://eodhd.com/api"
 
+# ---- HTTP --------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """
+    Delad Session (keep-alive + connection pool) för alla EODHD-anrop.
+    Retry med backoff på 429/5xx (Retry-After respekteras); komprimerade svar
+    (br om brotli finns). Poolen rymmer fler anslutningar än sync-kommandots trådar.
+    """
+    s = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    try:
+        import brotli  # type: ignore  # noqa: F401
+        s.headers["Accept-Encoding"] = "gzip, deflate, br"
+    except Exception:
+        s.headers["Accept-Encoding"] = "gzip, deflate"
+    return s
+
+def _json(resp: requests.Response) -> Any:
+    # orjson på råa bytes: ingen str-avkodning och ingen Python-tokenizer
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+@lru_cache(maxsize=1)
+def _api_key() -> str:
+    # Läses en gång per process (.env + env); rensa med _api_key.cache_clear()
+    return (get_eodhd_api_key() or "").strip()
+
+def http_get(path: str, params: Dict[str, Any] | None = None, *, timeout: float = 30) -> Any:
+    """
+    GET mot BASE/<path> med api_token & fmt=json. Nycklar med avslutande '_'
+    (t.ex. from_) skickas utan understreck. Returnerar tolkad JSON.
+    """
+    resp = _get(path, params, None, timeout)
+    resp.raise_for_status()
+    return _json(resp)
+
+def http_get_if_modified(
+    path: str,
+    params: Dict[str, Any] | None = None,
+    *,
+    last_modified: str | None = None,
+    timeout: float = 30,
+) -> Tuple[int, Any, str | None]:
+    """
+    Som http_get men villkorlig: `last_modified` är serverns egen Last-Modified
+    från ett tidigare svar och skickas ordagrant som If-Modified-Since.
+    Returnerar (status, json, last_modified); (304, None, ...) => inget ändrat.
+    Servrar som ignorerar headern svarar 200 som vanligt.
+    """
+    headers = {"If-Modified-Since": last_modified} if last_modified else None
+    resp = _get(path, params, headers, timeout)
+    if resp.status_code == 304:
+        return 304, None, last_modified
+    resp.raise_for_status()
+    return resp.status_code, _json(resp), resp.headers.get("Last-Modified")
+
+def _get(path: str, params: Dict[str, Any] | None, headers: Dict[str, str] | None, timeout: float) -> requests.Response:
+    q = {k.rstrip("_"): v for k, v in (params or {}).items() if v is not None}
+    q.setdefault("api_token", _api_key())
+    q.setdefault("fmt", "json")
+    return get_session().get(f"{BASE}/{path.lstrip('/')}", params=q, headers=headers, timeout=timeout)
+
 # ---- Index mapping helpers ---------------------------------------------------
 
 _INDEX_SENTINELS = {"DJUSTC", "SPLRCT"}  # kända indexkoder utan caret
@@ -31,12 +115,23 @@ def load_index_map(path: str | p.Path = "config/ticker_index_map.yml") -> Dict[s
     Läs YAML-map med indexsymboler. Returnerar {input_symbol: eodhd_symbol}.
     Stödjer både rot-nyckel 'map' och direkt nyckel->värde.
     """
-    path = p.Path(path)
-    if not path.exists() or yaml is None:
-        return {}
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return dict(_index_map_items(*_index_map_key(path)))
+
+def _index_map_key(path: str | p.Path) -> tuple[str, int]:
+    # (sökväg, mtime_ns); -1 = filen saknas
+    try:
+        return str(path), os.stat(path).st_mtime_ns
+    except OSError:
+        return str(path), -1
+
+@lru_cache(maxsize=8)
+def _index_map_items(path: str, mtime_ns: int) -> tuple[tuple[str, str], ...]:
+    # Tolkas en gång per filversion; ändrad fil => ny mtime => ny nyckel
+    if mtime_ns < 0 or yaml is None:
+        return ()
+    data = yaml.safe_load(p.Path(path).read_text(encoding="utf-8")) or {}
     m = data.get("map", data) or {}
-    return {str(k): str(v) for k, v in m.items()}
+    return tuple((str(k), str(v)) for k, v in m.items())
 
 def is_index_symbol(sym: str, mapping: Dict[str, str]) -> bool:
     """
@@ -83,6 +178,12 @@ def resolve_symbol_for_eodhd(
         return f"{sym}.INDX", True
     return sym, True
 
+@lru_cache(maxsize=4096)
+def _resolve_cached(sym: str, index_handling: str, map_path: str, map_mtime_ns: int) -> Tuple[str | None, bool]:
+    # Memoiserad resolve_symbol_for_eodhd; mappen identifieras av (sökväg, mtime)
+    idx_map = dict(_index_map_items(map_path, map_mtime_ns))
+    return resolve_symbol_for_eodhd(sym, index_handling=index_handling, index_map=idx_map)
+
 def _index_handling_defaults() -> tuple[str, str]:
     """Plocka defaults från env."""
     return (
@@ -102,29 +203,53 @@ def _parse_ts_col(df: pd.DataFrame, ts_key: str) -> pd.Series:
     # EODHD: intraday => "timestamp" (oftast UNIX sek/ms), daily => "date" (ISO)
     if ts_key == "timestamp":
         if pd.api.types.is_numeric_dtype(s):
-            vmax = pd.to_numeric(s, errors="coerce").astype("float64").abs().max()
-            unit = "ms" if (pd.notna(vmax) and vmax > 1e12) else "s"
+            # ett numpy-pass: finns något värde > 1e12 är det millisekunder (NaN jämför falskt)
+            arr = s.to_numpy()
+            unit = "ms" if bool((np.abs(arr) > 1e12).any()) else "s"
             return pd.to_datetime(s, unit=unit, utc=True, errors="coerce")
         return pd.to_datetime(s, utc=True, errors="coerce")
     else:  # "date"
         return pd.to_datetime(s, utc=True, errors="coerce")
 
+def _numeric_col(vals: list) -> Any:
+    # Vanligast: rena JSON-tal => en C-konvertering (int64/float64 som to_numeric
+    # ger). None, strängar m.m. ger object-array => to_numeric(coerce) som förut.
+    arr = np.asarray(vals)
+    if arr.dtype.kind in "iuf":
+        return arr
+    return pd.to_numeric(pd.Series(vals), errors="coerce")
+
 def _to_timeseries_df(data: list[dict]) -> pd.DataFrame:
     """Normalisera EODHD-svar → kolumner: ts (UTC), open, high, low, close, volume."""
     if not data:
         return pd.DataFrame(columns=["ts", "open", "high", "low", "close", "volume"])
-    df = pd.DataFrame(data)
-    ts_key = "timestamp" if "timestamp" in df.columns else ("date" if "date" in df.columns else None)
+    # Bygg kolumnvis direkt ur list-of-dicts: ingen objekt-DataFrame med alla
+    # fält (gmtoffset, datetime, ...) och ingen .copy() av urvalet.
+    keys = set().union(*data)
+    ts_key = "timestamp" if "timestamp" in keys else ("date" if "date" in keys else None)
     if ts_key is None:
         return pd.DataFrame(columns=["ts", "open", "high", "low", "close", "volume"])
-    df["ts"] = _parse_ts_col(df, ts_key)
-    cols = ["open", "high", "low", "close", "volume"]
-    keep = ["ts"] + [c for c in cols if c in df.columns]
-    df = df[keep].copy()
-    for c in cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df.dropna(subset=["ts"]).sort_values("ts").reset_index(drop=True)
+    raw_ts = pd.Series([r.get(ts_key) for r in data])
+    cols: Dict[str, Any] = {"ts": _parse_ts_col(pd.DataFrame({ts_key: raw_ts}), ts_key)}
+    for c in ("open", "high", "low", "close", "volume"):
+        if c in keys:
+            cols[c] = _numeric_col([r.get(c) for r in data])
+    vol = cols.get("volume")
+    if vol is not None:
+        # Heltalsvolym som kommit som float (1234.0) lagras som int64 (förlustfritt)
+        v = np.asarray(vol)
+        if v.dtype.kind == "f" and v.size and np.isfinite(v).all() and (v == np.trunc(v)).all() \
+                and np.abs(v).max() < 2**53:
+            cols["volume"] = v.astype(np.int64)
+    # dropna(ts) + sort_values(ts) + reset_index i ett pass: index på int64-vyn,
+    # en take per kolumn. EODHD svarar normalt stigande => ingen take alls.
+    i8 = cols["ts"].values.view("i8")
+    idx = np.flatnonzero(i8 != np.iinfo(np.int64).min)  # NaT
+    ts_valid = i8[idx]
+    if idx.size != i8.size or not (ts_valid[1:] >= ts_valid[:-1]).all():
+        idx = idx[np.argsort(ts_valid, kind="stable")]
+        cols = {c: (v.array if isinstance(v, pd.Series) else v).take(idx) for c, v in cols.items()}
+    return pd.DataFrame(cols)
 
 # ---- Public API --------------------------------------------------------------
 
@@ -136,6 +261,7 @@ def fetch_timeseries(
     *,
     index_handling: str | None = None,
     index_map_path: str | None = None,
+    precision: Literal["f64", "f32"] = "f64",
 ) -> pd.DataFrame:
     """
     Returnerar alltid DF med 'ts'(UTC), open/high/low/close/volume (några kan saknas beroende på källan).
@@ -143,31 +269,45 @@ def fetch_timeseries(
 
     index_handling: 'map' (default), 'skip', 'keep'
     index_map_path: sökväg till YAML med mapping
+    precision: 'f32' => priskolumner som float32 i returnerad DF (cachen är alltid float64)
     """
     # --- symbol-normalisering för index ---
     ih, imp = _index_handling_defaults()
     index_handling = (index_handling or ih).lower()
     index_map_path = (index_map_path or imp)
-    idx_map = load_index_map(index_map_path)
-
-    normalized, is_idx = resolve_symbol_for_eodhd(symbol, index_handling=index_handling, index_map=idx_map)
+    normalized, is_idx = _resolve_cached(symbol, index_handling, *_index_map_key(index_map_path))
     if normalized is None and is_idx:
         # avbryt tyst (tom df) om man valt skip
         return pd.DataFrame(columns=["ts", "open", "high", "low", "close", "volume"])
     symbol = normalized
 
     path = _cache_path(symbol, timeframe)
-    key = (api_key or get_eodhd_api_key() or "").strip()
+    key = (api_key or "").strip() or _api_key()
 
     if has_file(path) and not force:
         try:
             df = parquet_read(path)
-            if "ts" in df:
+            if "ts" in df and not is_utc_ts(df["ts"]):  # äldre cachefiler
                 df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
-            return df
+            return _with_precision(df, precision)
         except Exception:
             pass  # läs om från nät
 
+    # Samtidiga hämtningar av samma symbol/tf delar ett HTTP-anrop och en skrivning
+    df = _singleflight((symbol, timeframe), lambda: _download(symbol, timeframe, key, path))
+    return _with_precision(df, precision) if precision == "f32" else df.copy()
+
+_PRICE_COLS = ("open", "high", "low", "close")
+
+def _with_precision(df: pd.DataFrame, precision: str) -> pd.DataFrame:
+    # float32 halverar minne/bandbredd för indikatorer; ~7 signifikanta siffror
+    # räcker inte för 4-decimalers index => opt-in och aldrig i cachen
+    if precision != "f32":
+        return df
+    cols = {c: np.float32 for c in _PRICE_COLS if c in df.columns and df[c].dtype.kind == "f"}
+    return df.astype(cols) if cols else df.copy()
+
+def _download(symbol: str, timeframe: str, key: str, path: Path) -> pd.DataFrame:
     # --- bygg URL efter normalisering ---
     if timeframe == "1d":
         url = f"{BASE}/eod/{quote(symbol, safe='')}"
@@ -177,9 +317,9 @@ def fetch_timeseries(
         url = f"{BASE}/intraday/{quote(symbol, safe='')}"
         params = {"fmt": "json", "api_token": key, "interval": interval}
 
-    resp = requests.get(url, params=params, timeout=30)
+    resp = get_session().get(url, params=params, timeout=30)
     resp.raise_for_status()
-    data = resp.json()
+    data = _json(resp)
     if not isinstance(data, list):
         data = []
 
@@ -190,3 +330,29 @@ def fetch_timeseries(
 
     parquet_write(df, path)
     return df
+
+# ---- Singleflight ------------------------------------------------------------
+
+_INFLIGHT: Dict[Tuple[str, str], Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def _singleflight(key: Tuple[str, str], fn) -> Any:
+    """
+    Första anroparen för `key` kör fn(); övriga som kommer under tiden väntar
+    på samma Future och får samma resultat (eller undantag).
+    """
+    with _INFLIGHT_LOCK:
+        fut = _INFLIGHT.get(key)
+        leader = fut is None
+        if leader:
+            fut = _INFLIGHT[key] = Future()
+    if not leader:
+        return fut.result()
+    try:
+        fut.set_result(fn())
+    except BaseException as e:
+        fut.set_exception(e)
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+    return fut.result()
@@ -3,6 +3,8 @@ from __future__ import annotations
 import os, requests, time
 from typing import Optional, List, Dict, Any
 
+from .eodhd_client import _json, get_session
+
 EODHD_BASE = os.environ.get("EODHD_BASE", "https://eodhd.com/api")
 EODHD_TOKEN = os.environ.get("EODHD_API_TOKEN", "")
 
@@ -13,9 +15,9 @@ def search(query: str, limit: int = 10, exchange: Optional[str] = None) -> List[
     params = {"api_token": EODHD_TOKEN, "limit": int(limit), "fmt": "json"}
     if exchange:
         params["exchange"] = exchange
-    r = requests.get(url, params=params, timeout=20)
+    r = get_session().get(url, params=params, timeout=20)  # delad keep-alive-pool
     r.raise_for_status()
-    data = r.json()
+    data = _json(r)
     if isinstance(data, dict):
         data = data.get("data", [])
     return data or []
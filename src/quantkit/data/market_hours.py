@@ -1,15 +1,19 @@
 from __future__ import annotations
+from zoneinfo import ZoneInfo
 import pandas as pd
 
-def _hm(ts) -> int:
-    return int(pd.Timestamp(ts).strftime("%H%M"))
+# Tidszonen byggs en gång (tzdata läses inte om per anrop)
+_TZ = ZoneInfo("Europe/Stockholm")
+
+def _local(ts: pd.Timestamp | None) -> pd.Timestamp:
+    return ts.tz_convert(_TZ) if ts is not None else pd.Timestamp.now(tz=_TZ)
 
 def is_open_stockholm(ts: pd.Timestamp | None = None) -> bool:
-    now_local = (ts or pd.Timestamp.now(tz="Europe/Stockholm")).tz_convert("Europe/Stockholm")
+    now_local = _local(ts)
     dow = now_local.weekday() + 1
-    return (1 <= dow <= 5) and (900 <= _hm(now_local) <= 1735)
+    return (1 <= dow <= 5) and (900 <= now_local.hour * 100 + now_local.minute <= 1735)
 
 def is_open_us(ts: pd.Timestamp | None = None) -> bool:
-    now_local = (ts or pd.Timestamp.now(tz="Europe/Stockholm")).tz_convert("Europe/Stockholm")
+    now_local = _local(ts)
     dow = now_local.weekday() + 1
-    return (1 <= dow <= 5) and (1530 <= _hm(now_local) <= 2205)
+    return (1 <= dow <= 5) and (1530 <= now_local.hour * 100 + now_local.minute <= 2205)
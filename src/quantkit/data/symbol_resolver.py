@@ -1,9 +1,12 @@
 # src/quantkit/data/eodhd_loader.py
 from __future__ import annotations
+import time
 from pathlib import Path
 from typing import Literal
+import numpy as np
 import pandas as pd
-from .eodhd_client import http_get
+from .cache import dedup_sort_by_ts, is_utc_ts, parquet_read, parquet_write
+from .eodhd_client import _numeric_col, http_get_if_modified
 
 DATA_DIR = Path("data/cache/eodhd").resolve()
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -17,48 +20,152 @@ def _path(symbol: str, interval: str) -> Path:
 def _parse(rows) -> pd.DataFrame:
     if not rows:
         return pd.DataFrame(columns=["ts","open","high","low","close","volume"])
-    df = pd.DataFrame(rows)
-    if "datetime" in df.columns and "ts" not in df.columns:
-        df = df.rename(columns={"datetime":"ts"})
-    if "date" in df.columns and "ts" not in df.columns:
-        df = df.rename(columns={"date":"ts"})
+    # Kolumnvis ur list-of-dicts: ingen objekt-DataFrame med alla fält
+    keys = set().union(*rows)
+    ts_key = next((k for k in ("ts", "datetime", "date") if k in keys), None)
+    if ts_key is None:
+        raise KeyError("ts")
+    cols = {}
     for c in ["open","high","low","close","volume"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-        elif c.capitalize() in df.columns:
-            df[c] = pd.to_numeric(df[c.capitalize()], errors="coerce")
-    df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
+        src = c if c in keys else (c.capitalize() if c.capitalize() in keys else None)
+        if src is not None:
+            cols[c] = _numeric_col([r.get(src) for r in rows])
+    cols["ts"] = pd.to_datetime(pd.Series([r.get(ts_key) for r in rows]), utc=True, errors="coerce")
+    df = pd.DataFrame(cols)
     df = df.dropna(subset=["ts"]).sort_values("ts")
     return df[["ts","open","high","low","close","volume"]]
 
+def _read_cached(p: Path) -> pd.DataFrame:
+    # parquet_read memoiserar tabellen per (mtime, storlek) => oförändrad fil
+    # (t.ex. stängd marknad) avkodas inte om vid varje poll
+    cached = parquet_read(p)
+    if "ts" in cached and not is_utc_ts(cached["ts"]):  # äldre cachefiler
+        cached["ts"] = pd.to_datetime(cached["ts"], utc=True, errors="coerce")
+    return cached
+
+def _write_if_changed(out: pd.DataFrame, cached: pd.DataFrame, p: Path) -> None:
+    # Parquet går inte att appendera på plats; skriv bara om filen när
+    # deltat faktiskt tillförde (eller trimmade bort) rader.
+    if not cached.empty and len(out) == len(cached) and out.equals(cached):
+        return
+    if not out.index.equals(pd.RangeIndex(len(out))):
+        out = out.reset_index(drop=True)  # motsvarar index=False
+    # parquet_write lagrar ts som timestamp[UTC] => _read_cached behöver aldrig tolka om
+    parquet_write(out, p)
+
+def _merge_delta(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cache + nyhämtat, sorterat på ts; nyhämtad rad vinner vid samma ts (den
+    senaste baren kan ha cachats ofullständig). Cachen skrivs alltid sorterad,
+    så vanliga fallen (delta helt efter cachen, eller överlapp bara i svansen
+    som deltat täcker) blir en slice + concat utan sortering.
+    """
+    if cached.empty:
+        return fresh
+    if fresh.empty:
+        return cached
+    c_ts = cached["ts"].values
+    f_ts = fresh["ts"].values
+    if (f_ts[1:] > f_ts[:-1]).all():  # deltat strikt växande (inga dubbletter)
+        if f_ts[0] > c_ts[-1]:
+            return pd.concat([cached, fresh], ignore_index=True)
+        i = int(c_ts.searchsorted(f_ts[0]))
+        if np.isin(c_ts[i:], f_ts).all():
+            return pd.concat([cached.iloc[:i], fresh], ignore_index=True)
+    return dedup_sort_by_ts(pd.concat([fresh, cached], ignore_index=True))
+
+def _validator_path(p: Path) -> Path:
+    return p.with_name(p.name + ".lastmod")
+
+def _last_modified(p: Path, cached: pd.DataFrame) -> str | None:
+    # Serverns Last-Modified från senaste 200, inte filens mtime (den ändras vid
+    # checkout/restore/trim). Utan cache eller sparad validator: ingen header.
+    if cached.empty:
+        return None
+    try:
+        return _validator_path(p).read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+def _store_last_modified(p: Path, value: str | None) -> None:
+    v = _validator_path(p)
+    try:
+        if value:
+            v.write_text(value, encoding="utf-8")
+        else:
+            v.unlink(missing_ok=True)  # svaret saknade validator => skicka ingen nästa gång
+    except OSError:
+        pass  # best effort: utan validator blir nästa hämtning ovillkorlig
+
+# Senaste lyckade hämtning per (symbol, interval), time.monotonic()
+_LAST_FETCH: dict[tuple[str, str], float] = {}
+
+# Bar-längd (sek) per intradayintervall
+_INTERVAL_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "30m": 1800, "1h": 3600, "60m": 3600}
+
+def _interval_seconds(interval: str) -> int:
+    return _INTERVAL_SECONDS.get(interval, _INTERVAL_SECONDS.get(interval.lower(), 60))
+
+# Debounce för upprepade intradaypollningar; EOD grindas aldrig här (dagens
+# bar publiceras efter stängning och ska hämtas samma kväll)
+_DEBOUNCE_MAX_SECS = 300.0
+
+def _cache_is_fresh(symbol: str, interval: str, cached: pd.DataFrame) -> bool:
+    """
+    True om ett intraday-anrop inte kan ge något nytt: senaste cachade bar är
+    yngre än en bar-längd, eller samma symbol hämtades nyss (halv bar, max 5 min).
+    """
+    if cached.empty or interval.upper() == "EOD":
+        return False
+    bar_secs = _interval_seconds(interval)
+    last = _LAST_FETCH.get((symbol, interval))
+    if last is not None and time.monotonic() - last < min(bar_secs / 2, _DEBOUNCE_MAX_SECS):
+        return True
+    return time.time() - cached["ts"].max().timestamp() < bar_secs
+
 def load_intraday(symbol: str, interval: Interval = "5m",
                   days: int = 30, bootstrap_days: int = 500) -> pd.DataFrame:
+    now_utc = pd.Timestamp.now(tz="UTC")  # en gång; redan tz-medveten
     p = _path(symbol, interval)
-    cached = pd.read_parquet(p) if p.exists() else pd.DataFrame()
-    if cached.empty:
-        from_date = (pd.Timestamp.utcnow() - pd.Timedelta(days=bootstrap_days)).date().isoformat()
+    cached = _read_cached(p)
+    status, last_mod = 304, None  # debounce räknas som 304: validatorn står kvar
+    if _cache_is_fresh(symbol, interval, cached):
+        out = cached
     else:
-        from_date = cached["ts"].max().date().isoformat()
-    rows = http_get(f"intraday/{symbol}", dict(interval=interval, from_=from_date))
-    fresh = _parse(rows)
-    out = fresh if cached.empty else pd.concat([cached, fresh]).drop_duplicates("ts").sort_values("ts")
+        if cached.empty:
+            from_date = (now_utc - pd.Timedelta(days=bootstrap_days)).date().isoformat()
+        else:
+            from_date = cached["ts"].max().date().isoformat()
+        status, rows, last_mod = http_get_if_modified(
+            f"intraday/{symbol}", dict(interval=interval, from_=from_date),
+            last_modified=_last_modified(p, cached),
+        )
+        _LAST_FETCH[(symbol, interval)] = time.monotonic()
+        out = cached if status == 304 else _merge_delta(cached, _parse(rows))
     if days and days > 0:
-        cutoff = pd.Timestamp.utcnow().tz_localize("UTC") - pd.Timedelta(days=days)
-        out = out[out["ts"] >= cutoff]
-    out.to_parquet(p, index=False)
+        cutoff = now_utc - pd.Timedelta(days=days)
+        # out är sorterad på ts => binärsökning + vy i stället för bool-mask
+        out = out.iloc[int(out["ts"].searchsorted(cutoff)):]
+    _write_if_changed(out, cached, p)
+    if status != 304:
+        _store_last_modified(p, last_mod)
     return out
 
 def load_eod(symbol: str, years: int = 5) -> pd.DataFrame:
     p = _path(symbol, "EOD")
-    cached = pd.read_parquet(p) if p.exists() else pd.DataFrame()
+    cached = _read_cached(p)
     if cached.empty:
-        from_date = (pd.Timestamp.utcnow() - pd.DateOffset(years=years)).date().isoformat()
+        from_date = (pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=years)).date().isoformat()
     else:
         from_date = cached["ts"].max().date().isoformat()
-    rows = http_get(f"eod/{symbol}", dict(from_=from_date))
-    fresh = _parse(rows)
-    out = fresh if cached.empty else pd.concat([cached, fresh]).drop_duplicates("ts").sort_values("ts")
-    out.to_parquet(p, index=False)
+    status, rows, last_mod = http_get_if_modified(
+        f"eod/{symbol}", dict(from_=from_date), last_modified=_last_modified(p, cached)
+    )
+    if status == 304:
+        return cached  # oförändrat sedan förra svaret: ingen parse/merge/skrivning
+    out = _merge_delta(cached, _parse(rows))
+    _write_if_changed(out, cached, p)
+    _store_last_modified(p, last_mod)
     return out
 
 def load_bars(symbol: str, *, interval: str = "5m", days: int = 30) -> pd.DataFrame:
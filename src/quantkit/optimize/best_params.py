@@ -1,9 +1,9 @@
 # src/quantkit/optimize/best_params.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Any, Dict, Optional
-from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 import json
+import time
 
 try:
     import yaml  # type: ignore
@@ -14,6 +14,18 @@ except Exception:
 ROOT_STD = Path("data/optuna/best").resolve()
 ROOT_STD.mkdir(parents=True, exist_ok=True)
 
+# (symbol, strategy) -> (checked_at, root_mtime, källfil, källfilens mtime, params)
+_BEST_CACHE: Dict[Tuple[str, str], Tuple[float, Optional[int], Optional[Path], Optional[int], Optional[Dict[str, Any]]]] = {}
+_STAT_TTL_SEC = 60.0
+
+def _mtime_ns(p: Optional[Path]) -> Optional[int]:
+    if p is None:
+        return None
+    try:
+        return p.stat().st_mtime_ns
+    except OSError:
+        return None
+
 def _load_json(p: Path) -> Optional[Dict[str, Any]]:
     try:
         return json.loads(p.read_text(encoding="utf-8"))
@@ -54,15 +66,7 @@ def _exch_from_symbol(symbol: str) -> Optional[str]:
         return symbol.rsplit(".", 1)[-1]
     return None
 
-@lru_cache(maxsize=1024)
-def load_best_params(symbol: str, strategy: str) -> Optional[Dict[str, Any]]:
-    """
-    Hämta bästa parametrar i följande ordning:
-      1) data/optuna/best/{symbol}__{strategy}.json|yaml
-      2) data/optuna/best/{EXCH}__{strategy}.json|yaml   (EXCH = ST/US/…)
-      3) data/optuna/best/_ALL__{strategy}.json|yaml
-      4) reports/optuna/<symbol>/<strategy>/{best.json|best.yaml|result.json}
-    """
+def _candidates(symbol: str, strategy: str) -> list[Path]:
     candidates = []
     exch = _exch_from_symbol(symbol)
     # standardplats
@@ -77,22 +81,48 @@ def load_best_params(symbol: str, strategy: str) -> Optional[Dict[str, Any]]:
     for ext in (".json", ".yaml", ".yml"):
         for nm in ("best", "best_params", "result"):
             candidates.append(base / f"{nm}{ext}")
+    return candidates
 
-    for p in candidates:
+def _find_best_params(symbol: str, strategy: str) -> Tuple[Optional[Path], Optional[Dict[str, Any]]]:
+    for p in _candidates(symbol, strategy):
         params = _try_one(p)
         if params:
+            return p, params
+    return None, None
+
+def load_best_params(symbol: str, strategy: str) -> Optional[Dict[str, Any]]:
+    """
+    Hämta bästa parametrar i följande ordning:
+      1) data/optuna/best/{symbol}__{strategy}.json|yaml
+      2) data/optuna/best/{EXCH}__{strategy}.json|yaml   (EXCH = ST/US/…)
+      3) data/optuna/best/_ALL__{strategy}.json|yaml
+      4) reports/optuna/<symbol>/<strategy>/{best.json|best.yaml|result.json}
+
+    Resultatet cachas per (symbol, strategy). Högst en gång per minut stat:as
+    best-katalogen och träffens källfil; ändrad mtime => läs om från disk.
+    """
+    key = (symbol, strategy)
+    now = time.monotonic()
+    hit = _BEST_CACHE.get(key)
+    if hit is not None:
+        checked_at, root_mt, src, src_mt, params = hit
+        if now - checked_at < _STAT_TTL_SEC:
+            return params
+        if _mtime_ns(ROOT_STD) == root_mt and _mtime_ns(src) == src_mt:
+            _BEST_CACHE[key] = (now, root_mt, src, src_mt, params)
             return params
-    return None
+
+    root_mt = _mtime_ns(ROOT_STD)
+    src, params = _find_best_params(symbol, strategy)
+    _BEST_CACHE[key] = (now, root_mt, src, _mtime_ns(src), params)
+    return params
 
 def save_best_params(symbol: str, strategy: str, params: Dict[str, Any]) -> Path:
     out = ROOT_STD / f"{symbol}__{strategy}.json"
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(json.dumps({"best_params": params}, indent=2), encoding="utf-8")
     # clear cache entry
-    try:
-        load_best_params.cache_clear()  # type: ignore[attr-defined]
-    except Exception:
-        pass
+    _BEST_CACHE.clear()
     return out
 
 def harvest_from_path(result_path: str | Path, symbol: str, strategy: str) -> Optional[Path]:
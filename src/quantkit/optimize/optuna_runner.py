@@ -1,5 +1,6 @@
 # src/quantkit/optimize/optuna_runner.py
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
 import json, math
 import numpy as np
@@ -60,23 +61,35 @@ def _suggest_params(trial: optuna.Trial, strategy_id: str, defaults: dict) -> di
     return p
 
 
+@lru_cache(maxsize=32)
+def _load_norm_bars(symbol: str, interval: str, days: int) -> pd.DataFrame | None:
+    """
+    Ladda + normalisera bars en gång per (symbol, interval, days); delas av alla
+    trials i en studie. run() tömmer cachen vid start => ny studie, färska bars.
+    """
+    bars_raw = load_bars(symbol, interval=interval, days=days)
+    if bars_raw is None or bars_raw.empty:
+        return None
+    return normalize_ohlcv(bars_raw)
+
+
 def _evaluate(symbol: str, strategy_id: str, params: dict, interval: str, days: int):
     SREG.ensure_populated()
     spec = SREG.get(strategy_id)
 
-    bars_raw = load_bars(symbol, interval=interval, days=days)
-    if bars_raw is None or bars_raw.empty:
+    bars = _load_norm_bars(symbol, interval, days)
+    if bars is None:
         return dict(n_trades=0, win_rate=0.0, profit_factor=0.0, expectancy=0.0, cagr=0.0, mdd=0.0, equity=None, trades=pd.DataFrame())
 
-    bars = normalize_ohlcv(bars_raw)
-    sig = SREG.generate(strategy_id, bars.copy(), params=params or {})
+    # bars är read-only: varken strategierna eller run_signals muterar ramen
+    sig = SREG.generate(strategy_id, bars, params=params or {})
     entry = sig["entry"].astype(bool)
     exit_rule = sig["exit"].astype(bool)
     meta = dict(sig.get("meta", {}))
     side = (meta.get("side") or spec.direction or "long").lower()
 
     res = run_signals(
-        bars=bars.copy(), entry=entry, exit_rule=exit_rule, side=side,
+        bars=bars, entry=entry, exit_rule=exit_rule, side=side,
         sl_pct=meta.get("sl_pct"), tp_pct=meta.get("tp_pct"), max_bars=meta.get("max_bars"),
         fee_bps=0.0, slippage_bps=0.0, commission_plan="none", qty=1.0,
     )
@@ -85,7 +98,7 @@ def _evaluate(symbol: str, strategy_id: str, params: dict, interval: str, days:
     if isinstance(equity, pd.DataFrame) and "equity" in equity:
         equity = equity.set_index(pd.to_datetime(equity.get("ts", equity.index)))["equity"]
     elif not isinstance(equity, pd.Series):
-        equity = pd.Series(range(len(bars)), index=pd.to_datetime(bars["ts"]), name="equity").astype(float)
+        equity = pd.Series(range(len(bars)), index=bars["ts"], name="equity").astype(float)
         equity[:] = float(100_000.0)
 
     trades = getattr(res, "trades", None)
@@ -130,10 +143,12 @@ def run(
     n_trials: int = 50,
     objective: str = "pp",          # 'pp' (Percent Profitable), 'pf', 'exp', 'sharpe' (enkel proxy), 'custom'
     min_trades: int = 8,
+    n_jobs: int = 1,                # >1: parallella trials (optuna-trådar; bars laddas en gång)
 ):
     SREG.ensure_populated()
     spec = SREG.get(strategy)
     defaults = spec.defaults or {}
+    _load_norm_bars.cache_clear()  # per studie: uppdaterad parquet sedan förra run() ska läsas om
 
     out_root = Path("reports/optuna") / f"{symbol}__{strategy}"
     out_root.mkdir(parents=True, exist_ok=True)
@@ -188,7 +203,7 @@ def run(
         trial.set_user_attr("mdd", metrics["mdd"])
         return score
 
-    study.optimize(_obj, n_trials=n_trials)
+    study.optimize(_obj, n_trials=n_trials, n_jobs=n_jobs)
 
     # spara trials.csv
     try:
@@ -85,6 +85,15 @@ def _get(t: Any, key: str, default: Any = None) -> Any:
         return t.get(key, default)
     return getattr(t, key, default)
 
+def _ts_indexed(bars: pd.DataFrame) -> pd.DataFrame:
+    """Indexera på ts; parsa bara om kolumnen inte redan är datetime64."""
+    if isinstance(bars.index, pd.DatetimeIndex):
+        return bars
+    ts = bars["ts"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    return bars.set_index(ts)
+
 def _bar_at_or_before(bars: pd.DataFrame, ts: pd.Timestamp) -> pd.Series:
     """Returnera baren vid ts, annars närmast innan (fallback)."""
     try:
@@ -97,9 +106,15 @@ def _bar_at_or_before(bars: pd.DataFrame, ts: pd.Timestamp) -> pd.Series:
 # ---------- trade-deriverade tabeller ----------
 # ... (imports och övrigt som du har) ...
 
-def make_trade_df(bars: pd.DataFrame, trades: Iterable[TradeLike], qty: float = 1.0) -> pd.DataFrame:
-    if not isinstance(bars.index, pd.DatetimeIndex):
-        bars = bars.set_index(pd.to_datetime(bars["ts"]))
+def _trade_fields(trades: Iterable[TradeLike | dict] | pd.DataFrame):
+    """(entry_ts, exit_ts, entry_px, exit_px, reason, bars_held) per trade."""
+    if isinstance(trades, pd.DataFrame):
+        # kolumnvis – ingen to_dict("records") med en dict per rad
+        n = len(trades)
+        def _col(key: str, default):
+            return trades[key].tolist() if key in trades.columns else [default] * n
+        return zip(_col("entry_ts", None), _col("exit_ts", None), _col("entry_px", 0.0),
+                   _col("exit_px", 0.0), _col("reason", "Exit"), _col("bars_held", 0))
 
     def _get(obj, key: str, default=None):
         # Klarar dataclass/objekt/dict
@@ -109,14 +124,22 @@ def make_trade_df(bars: pd.DataFrame, trades: Iterable[TradeLike], qty: float =
             return getattr(obj, key)
         return default
 
+    return ((_get(t, "entry_ts"), _get(t, "exit_ts"), _get(t, "entry_px", 0.0),
+             _get(t, "exit_px", 0.0), _get(t, "reason", "Exit"), _get(t, "bars_held", 0))
+            for t in trades)
+
+def make_trade_df(bars: pd.DataFrame, trades: Iterable[TradeLike | dict] | pd.DataFrame,
+                  qty: float = 1.0) -> pd.DataFrame:
+    bars = _ts_indexed(bars)
+
     rows = []
-    for t in trades:
-        entry_ts = pd.Timestamp(_get(t, "entry_ts"))
-        exit_ts  = pd.Timestamp(_get(t, "exit_ts"))
-        entry_px = float(_get(t, "entry_px", 0.0))
-        exit_px  = float(_get(t, "exit_px", 0.0))
-        reason   = str(_get(t, "reason", "Exit"))
-        bars_held= int(_get(t, "bars_held", 0))
+    for entry_ts, exit_ts, entry_px, exit_px, reason, bars_held in _trade_fields(trades):
+        entry_ts = pd.Timestamp(entry_ts)
+        exit_ts  = pd.Timestamp(exit_ts)
+        entry_px = float(entry_px)
+        exit_px  = float(exit_px)
+        reason   = str(reason)
+        bars_held= int(bars_held)
 
         span = bars.loc[entry_ts: exit_ts]
         high = float(span["high"].max()) if len(span) else entry_px
@@ -342,14 +365,22 @@ def _format_summary(d: dict) -> pd.DataFrame:
 def _format_trade_list(trades: pd.DataFrame) -> pd.DataFrame:
     if not len(trades):
         return pd.DataFrame(columns=["#","Type","Date/Time","Signal","Price","Profit/Loss","% Profit","Run-up","Drawdown","Efficiency"])
-    rows = []; cum_pnl = 0.0
-    for i, r in trades.iterrows():
-        rows.append({"#":int(i+1),"Type":"Buy","Date/Time":pd.to_datetime(r["entry_ts"]).strftime("%Y-%m-%d"),
-                     "Signal":"Buy","Price":r["entry_px"],"Profit/Loss":"","% Profit":"","Run-up":"","Drawdown":"","Efficiency":""})
-        cum_pnl += float(r["pnl"])
-        rows.append({"#":"","Type":"Sell","Date/Time":pd.to_datetime(r["exit_ts"]).strftime("%Y-%m-%d"),
-                     "Signal":r.get("reason","Exit"),"Price":r["exit_px"],"Profit/Loss":r["pnl"],
-                     "% Profit":r["ret"]*100.0,"Run-up":r["mfe"]*100.0,"Drawdown":r["mae"]*100.0,"Efficiency":r["efficiency"]*100.0})
+    # kolumnvis i stället för iterrows (som boxar varje rad i en Series)
+    n = len(trades)
+    entry_d = pd.to_datetime(trades["entry_ts"]).dt.strftime("%Y-%m-%d").tolist()
+    exit_d = pd.to_datetime(trades["exit_ts"]).dt.strftime("%Y-%m-%d").tolist()
+    reason = trades["reason"].tolist() if "reason" in trades else ["Exit"] * n
+    rows = []
+    for i, ed, xd, rs, epx, xpx, pnl, ret, mfe, mae, eff in zip(
+        trades.index.tolist(), entry_d, exit_d, reason,
+        trades["entry_px"].tolist(), trades["exit_px"].tolist(), trades["pnl"].tolist(),
+        trades["ret"].tolist(), trades["mfe"].tolist(), trades["mae"].tolist(), trades["efficiency"].tolist(),
+    ):
+        rows.append({"#":int(i+1),"Type":"Buy","Date/Time":ed,
+                     "Signal":"Buy","Price":epx,"Profit/Loss":"","% Profit":"","Run-up":"","Drawdown":"","Efficiency":""})
+        rows.append({"#":"","Type":"Sell","Date/Time":xd,
+                     "Signal":rs,"Price":xpx,"Profit/Loss":pnl,
+                     "% Profit":ret*100.0,"Run-up":mfe*100.0,"Drawdown":mae*100.0,"Efficiency":eff*100.0})
     df = pd.DataFrame(rows)
     for col in ["Price","Profit/Loss"]:
         df[col] = df[col].apply(lambda x: "" if x=="" else f"{x:,.2f}")
@@ -474,13 +505,13 @@ def kpi_panel(summary: dict[str, float], trades: pd.DataFrame, equity: pd.Series
     </div>"""
 
 
-def build_report(bars: pd.DataFrame, equity: pd.Series, trades_like: Iterable[TradeLike | dict], *,
+def build_report(bars: pd.DataFrame, equity: pd.Series, trades_like: Iterable[TradeLike | dict] | pd.DataFrame, *,
                  symbol: str, run_id: str, out_dir: Path, tz: str = "Europe/Stockholm",
                  commission_total: float = 0.0, bps_fees_total: float = 0.0, slippage_total: float = 0.0,
                  strategy_name: str = "", strategy_params: dict | None = None,
                  init_capital: float = 100_000.0) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
-    bars_idx = bars if isinstance(bars.index, pd.DatetimeIndex) else bars.set_index(pd.to_datetime(bars["ts"]))
+    bars_idx = _ts_indexed(bars)
     trades_df = make_trade_df(bars_idx, trades_like)
     trades_df.to_csv(out_dir / "trades.csv", index=False)
     summary = performance_summary(trades_df, equity, commission_total, bps_fees_total, slippage_total)
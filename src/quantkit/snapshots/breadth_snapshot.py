@@ -8,11 +8,12 @@ from typing import List, Dict
 
 import numpy as np
 import pandas as pd
-import requests
 import typer
 import yaml
 
 from quantkit.data.eodhd_client import (
+    _json,
+    get_session,
     load_index_map,
     resolve_symbol_for_eodhd,
 )
@@ -73,9 +74,10 @@ def _fetch_eod(symbol: str, api_key: str, days_back: int = 420) -> pd.DataFrame:
     url = f"https://eodhd.com/api/eod/{quote(symbol, safe='')}"
     frm = (pd.Timestamp.utcnow().date() - pd.Timedelta(days=days_back)).isoformat()
     params = {"api_token": api_key, "fmt": "json", "period": "d", "from": frm}
-    r = requests.get(url, params=params, timeout=30)
+    # delad Session (keep-alive + retry); requests kodar params mot den
+    r = get_session().get(url, params=params, timeout=30)
     r.raise_for_status()
-    js = r.json()
+    js = _json(r)
     if not isinstance(js, list) or not js:
         return pd.DataFrame(columns=["ts", "open", "high", "low", "close", "volume"])
 
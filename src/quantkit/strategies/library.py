@@ -19,7 +19,11 @@ class StratOut:
     side: Side = "long"
 
 def _idx(df: pd.DataFrame) -> pd.Index:
-    return pd.to_datetime(df["ts"]) if "ts" in df else df.index
+    if "ts" not in df:
+        return df.index
+    ts = df["ts"]
+    # normalize_ohlcv levererar redan datetime64 – tolka bara om vid behov
+    return ts if pd.api.types.is_datetime64_any_dtype(ts) else pd.to_datetime(ts)
 
 # --- Luke Skywalker (long) ---
 def luke(df: pd.DataFrame) -> StratOut:
@@ -0,0 +1,18 @@
+# tests/test_breadth.py
+import pandas as pd
+
+from quantkit.data.breadth_provider import compute_breadth_from_constituents
+
+
+def test_breadth_counts_per_day():
+    ts = pd.date_range("2024-01-01", periods=3, freq="D", tz="UTC")
+    out = compute_breadth_from_constituents(
+        {
+            "A.US": pd.DataFrame({"ts": ts, "close": [10.0, 11.0, 11.0]}),
+            "B.US": pd.DataFrame({"ts": ts, "close": [5.0, 4.0, 6.0]}),
+            "C.US": pd.DataFrame(columns=["ts", "close"]),
+        },
+        "US",
+    )
+    assert list(out["time"]) == list(ts[1:])
+    assert out[["advances", "declines", "unchanged"]].values.tolist() == [[1, 1, 0], [1, 0, 1]]
@@ -0,0 +1,77 @@
+# tests/test_cache.py
+import pandas as pd
+
+from quantkit.data.cache import merge_bars, parquet_read, parquet_write
+
+
+def test_merge_bars_keeps_last_per_key(tmp_path):
+    p = tmp_path / "bars.parquet"
+    old = pd.DataFrame({"Date": pd.to_datetime(["2024-01-01", "2024-01-02"]), "Symbol": "A", "Close": [1.0, 2.0]})
+    parquet_write(old, p)
+    new = pd.DataFrame({"Date": pd.to_datetime(["2024-01-03", "2024-01-02"]), "Symbol": "A", "Close": [3.0, 20.0]})
+    out = merge_bars(new, p)
+    assert out["Close"].tolist() == [1.0, 20.0, 3.0]
+    assert parquet_read(p)["Close"].tolist() == [1.0, 20.0, 3.0]
+
+
+def test_dedup_sort_by_ts_keeps_first():
+    from quantkit.data.cache import dedup_sort_by_ts
+
+    ts = pd.to_datetime(["2024-01-02", "2024-01-01", "2024-01-02"], utc=True)
+    out = dedup_sort_by_ts(pd.DataFrame({"ts": ts, "close": [1.0, 2.0, 3.0]}))
+    assert out["close"].tolist() == [2.0, 1.0]
+
+
+def test_parquet_write_survives_locked_sidecar(tmp_path, monkeypatch):
+    # Windows: en öppen mappning hindrar replace/unlink av sidokopian
+    from pathlib import Path
+
+    from quantkit.data import cache
+
+    p = tmp_path / "bars.parquet"
+    big = pd.DataFrame({"ts": pd.date_range("2024", periods=cache._ARROW_SIDECAR_MIN_ROWS, freq="min", tz="UTC"), "close": 1.0})
+    parquet_write(big, p)
+    assert parquet_read(p).equals(big)
+
+    real_unlink, real_replace = Path.unlink, Path.replace
+
+    def locked(self, *a, **k):
+        if ".arrow" in self.name:
+            raise PermissionError("in use")
+        return (real_replace if a else real_unlink)(self, *a, **k)
+
+    monkeypatch.setattr(Path, "unlink", locked)
+    monkeypatch.setattr(Path, "replace", locked)
+    parquet_write(big.iloc[:10], p)  # ska inte kasta
+    assert len(parquet_read(p)) == 10  # gammal sidokopia matchar inte parquet => ignoreras
+    parquet_write(big.assign(close=2.0), p)
+    monkeypatch.undo()
+    assert parquet_read(p)["close"].eq(2.0).all()
+
+
+def test_sidecar_ignored_after_rewrite_in_same_mtime_tick(tmp_path):
+    import os
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from quantkit.data import cache
+
+    p = tmp_path / "bars.parquet"
+    n = cache._ARROW_SIDECAR_MIN_ROWS
+    parquet_write(pd.DataFrame({"ts": pd.date_range("2024", periods=n, freq="min", tz="UTC"), "close": 1.0}), p)
+    st = p.stat()
+    # annan skrivare, samma mtime-tick (grov klocka)
+    pq.write_table(pa.table({"ts": pd.date_range("2024", periods=5, freq="min", tz="UTC"), "close": [2.0] * 5}), p)
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert len(parquet_read(p)) == 5
+
+
+def test_parquet_write_only_normalizes_datetime_ts(tmp_path):
+    p = tmp_path / "a.parquet"
+    naive = pd.DataFrame({"ts": pd.to_datetime(["2024-01-02 10:00"]), "close": [1.0]})
+    parquet_write(naive, p)
+    assert str(parquet_read(p)["ts"].iloc[0]) == "2024-01-02 10:00:00+00:00"
+    epoch = pd.DataFrame({"ts": [1700000000, 1700000300], "close": [1.0, 2.0]})
+    parquet_write(epoch, p)
+    assert parquet_read(p)["ts"].tolist() == [1700000000, 1700000300]
@@ -0,0 +1,33 @@
+# tests/test_cache_remote.py
+from quantkit.data import cache_remote as cr
+
+
+class _Resp:
+    def __init__(self, status, body=b"", etag=None):
+        self.status_code = status
+        self.content = body
+        self.text = body.decode()
+        self.headers = {"Content-Type": "text/plain", **({"ETag": etag} if etag else {})}
+
+
+def test_downloaded_copy_is_revalidated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sent = []
+    replies = [
+        _Resp(200, b"ts,close\n2024-01-02,1.0\n", etag='"v1"'),
+        _Resp(304),
+        _Resp(200, b"ts,close\n2024-01-02,1.0\n2024-01-03,2.0\n", etag='"v2"'),
+    ]
+
+    class _Sess:
+        def get(self, url, headers=None, timeout=None):
+            sent.append(dict(headers or {}))
+            return replies.pop(0)
+
+    monkeypatch.setattr(cr, "_session", lambda: _Sess())
+    assert len(cr.load_cached_csv("AAPL.US", "1d", token="")) == 1
+    # prefer_local (default) ska inte servera nedladdad kopia utan revalidering
+    assert len(cr.load_cached_csv("AAPL.US", "1d", token="")) == 1
+    assert sent[1].get("If-None-Match") == '"v1"'
+    assert len(cr.load_cached_csv("AAPL.US", "1d", token="")) == 2
+    assert not cr._local_cache_path("AAPL.US", "1d").exists()
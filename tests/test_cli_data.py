@@ -0,0 +1,121 @@
+# tests/test_cli_data.py
+from quantkit.cli_data import _coerce_list, _resolve_tickers
+
+
+def test_coerce_list_mixed_separators():
+    assert _coerce_list("AAPL.US,ABB.ST") == ["AAPL.US", "ABB.ST"]
+    assert _coerce_list(" AAPL.US, ABB.ST;VOLV-B.ST\n") == ["AAPL.US", "ABB.ST", "VOLV-B.ST"]
+    assert _coerce_list(None) == []
+
+
+def test_resolve_tickers_dedup_grouped_by_exchange():
+    got = _resolve_tickers("ABB.ST,AAPL.US,ABB.ST,VOLV-B.ST,MSFT.US")
+    assert got == ["ABB.ST", "VOLV-B.ST", "AAPL.US", "MSFT.US"]
+
+
+def test_filter_by_market_open_queries_once(monkeypatch):
+    import quantkit.cli_data as cd
+    from quantkit.data import market_hours as mh
+
+    calls = []
+    monkeypatch.setattr(mh, "is_open_us", lambda: calls.append("us") or False)
+    monkeypatch.setattr(mh, "is_open_stockholm", lambda: calls.append("se") or True)
+    cd._mkt_open_cached.cache_clear()
+    run, closed = cd._filter_by_market_open(["AAPL.US", "ABB.ST", "MSFT.US", "BTC-USD.CC"])
+    assert run == ["ABB.ST", "BTC-USD.CC"]
+    assert closed == ["AAPL.US", "MSFT.US"]
+    assert sorted(calls) == ["se", "us"]
+
+
+def test_fail_cache_roundtrip(tmp_path):
+    from quantkit.cli_data import _FailCache
+
+    path = tmp_path / "fail_cache.json"
+    fc = _FailCache(path, ttl=600)
+    fc.mark("DEAD.US", "5m")
+    fc.save()
+    again = _FailCache(path, ttl=600)
+    assert again.blocked("DEAD.US", "5m")
+    assert not again.blocked("DEAD.US", "EOD")
+    again.clear("DEAD.US", "5m")
+    assert not again.blocked("DEAD.US", "5m")
+
+
+def test_notify_posts_to_both_channels(monkeypatch):
+    import requests
+    from quantkit.cli_data import _notify
+
+    posted = []
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.example/slack")
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "tok")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "42")
+    monkeypatch.setattr(requests, "post", lambda url, **kw: posted.append(url))
+    _notify("hej")
+    assert sorted(posted) == ["https://api.telegram.org/bottok/sendMessage", "https://hooks.example/slack"]
+
+
+def test_token_bucket_aimd_bounds():
+    from quantkit.cli_data import _bucket_for
+
+    b = _bucket_for(0.25)  # 4 anrop/s
+    for _ in range(100):
+        b.on_success()
+    assert b.rate == 8.0
+    for _ in range(10):
+        b.on_throttle()
+    assert b.rate == 0.25
+
+
+def test_is_throttle_sees_429_after_session_retries(monkeypatch):
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    import pytest
+    import requests
+
+    from quantkit.cli_data import _is_throttle
+    from quantkit.data import eodhd_client as ec
+
+    class Always429(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(429)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    srv = HTTPServer(("127.0.0.1", 0), Always429)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    # riktiga sessionen, bara utan backoff-väntan
+    real_retry = ec.Retry
+    monkeypatch.setattr(ec, "Retry", lambda **kw: real_retry(**{**kw, "backoff_factor": 0}))
+    ec.get_session.cache_clear()
+    try:
+        with pytest.raises(requests.exceptions.RequestException) as ei:
+            ec.get_session().get(f"http://127.0.0.1:{srv.server_port}/x", timeout=5)
+        assert _is_throttle(ei.value)
+        assert not _is_throttle(RuntimeError("boom"))
+    finally:
+        srv.shutdown()
+        ec.get_session.cache_clear()
+
+
+def test_fail_cached_symbols_still_fail_the_run(tmp_path, monkeypatch, capsys):
+    import functools
+
+    import quantkit.cli_data as cd
+
+    path = tmp_path / "fail.json"
+    fc = cd._FailCache(path, ttl=600)
+    fc.mark("BAD.US", "EOD")
+    fc.save()
+    monkeypatch.setattr(cd, "_FailCache", functools.partial(cd._FailCache, path))
+    monkeypatch.setattr(cd, "_load_bars_safe", lambda *a, **k: [1, 2])
+    notes = []
+    monkeypatch.setattr(cd, "_notify", notes.append)
+
+    code = cd._run_sync("BAD.US,OK.US", "EOD", None, 10, 10, False, 0.0, False, fail_ttl=600)
+    assert code == 1
+    assert "skipped_closed=0, skipped_failed=1" in notes[0]
+    assert "✔ OK.US EOD" in capsys.readouterr().out
@@ -0,0 +1,37 @@
+# tests/test_eodhd_client.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from quantkit.data import eodhd_client as ec
+
+
+def test_singleflight_shares_one_call():
+    calls = []
+    gate = threading.Event()
+
+    def work():
+        calls.append(1)
+        gate.wait(1)
+        return "df"
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futs = [ex.submit(ec._singleflight, ("AAPL.US", "5m"), work) for _ in range(4)]
+        time.sleep(0.05)
+        gate.set()
+        results = [f.result() for f in futs]
+
+    assert results == ["df"] * 4
+    assert len(calls) == 1
+    assert not ec._INFLIGHT
+
+
+def test_to_timeseries_df_sorts_and_coerces():
+    rows = [
+        {"timestamp": 1700000300, "open": "2", "close": None, "volume": 5},
+        {"timestamp": 1700000000, "open": 1, "close": 1.5, "volume": 10},
+    ]
+    df = ec._to_timeseries_df(rows)
+    assert df["volume"].tolist() == [10, 5]
+    assert df["open"].tolist() == [1.0, 2.0]
+    assert str(df["ts"].dt.tz) == "UTC"
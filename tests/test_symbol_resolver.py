@@ -0,0 +1,48 @@
+# tests/test_symbol_resolver.py
+import pandas as pd
+
+from quantkit.data import symbol_resolver as sr
+
+
+def test_eod_after_close_still_fetches(tmp_path, monkeypatch):
+    monkeypatch.setattr(sr, "DATA_DIR", tmp_path)
+    today = pd.Timestamp.now(tz="UTC").normalize()
+    calls = []
+
+    def fake_get(path, params, last_modified=None):
+        calls.append(path)
+        return 200, [{"date": str(today.date()), "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}], None
+
+    monkeypatch.setattr(sr, "http_get_if_modified", fake_get)
+    sr.load_eod("X.US")  # t.ex. 14:00 UTC, med en preliminär bar för idag
+    assert len(calls) == 1
+    # samma process efter stängning: ingen debounce för EOD, ska hämta igen
+    sr.load_eod("X.US")
+    assert len(calls) == 2
+
+
+def test_eod_sends_back_the_servers_last_modified(tmp_path, monkeypatch):
+    monkeypatch.setattr(sr, "DATA_DIR", tmp_path)
+    sent = []
+
+    def fake_get(path, params, last_modified=None):
+        sent.append(last_modified)
+        row = {"date": "2024-01-02", "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
+        return 200, [row], "Tue, 02 Jan 2024 22:00:00 GMT"
+
+    monkeypatch.setattr(sr, "http_get_if_modified", fake_get)
+    sr.load_eod("X.US")
+    sr.load_eod("X.US")
+    assert sent == [None, "Tue, 02 Jan 2024 22:00:00 GMT"]
+    # utan sparad validator (t.ex. parquet återställd från artefakt) skickas ingen header
+    sr._validator_path(sr._path("X.US", "EOD")).unlink()
+    sr.load_eod("X.US")
+    assert sent[-1] is None
+
+
+def test_merge_delta_drops_repeated_ts_after_cache():
+    ts = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02"], utc=True)
+    cached = pd.DataFrame({"ts": ts[:1], "close": [1.0]})
+    fresh = pd.DataFrame({"ts": ts[1:], "close": [2.0, 3.0]})
+    out = sr._merge_delta(cached, fresh)
+    assert out["ts"].is_unique and len(out) == 2
@@ -3,7 +3,7 @@ import pandas as pd
 from quantkit.data.yf_loader import load_bars_or_synth
 from quantkit.strategies.registry import REGISTRY
 from quantkit.backtest.engine2 import run_signals
-from quantkit.reporting.ts_report import build_report, TradeLike
+from quantkit.reporting.ts_report import build_report
 
 sym = "AAPL"; days = 1200
 
@@ -27,24 +27,12 @@ print("Equity points:", len(rr.equity), "| Trades:", len(rr.trades))
 out_dir = Path("reports")/sym/"manual"
 out_dir.mkdir(parents=True, exist_ok=True)
 
-trades_like = [
-    TradeLike(
-        entry_ts=pd.Timestamp(r.entry_ts),
-        exit_ts=pd.Timestamp(r.exit_ts),
-        entry_px=float(r.entry_px),
-        exit_px=float(r.exit_px),
-        reason=str(r.reason),
-        bars_held=int(r.bars_held),
-    )
-    for r in rr.trades.itertuples(index=False)
-]
-
 def colsum(df: pd.DataFrame, col: str) -> float:
     return float(df[col].sum()) if col in df.columns else 0.0
 
 html = build_report(
     bars=bars.set_index(pd.to_datetime(bars["ts"])),
-    equity=rr.equity, trades_like=trades_like,
+    equity=rr.equity, trades_like=rr.trades,
     symbol=sym, run_id="manual", out_dir=out_dir,
     commission_total=colsum(rr.trades, "commission"),
     bps_fees_total=colsum(rr.trades, "cost_bps"),